@@ -1,9 +1,13 @@
-from apolo_sdk import PluginManager
+from typing import TYPE_CHECKING
 
 from .main import main  # noqa
 from .version import __version__  # noqa
 
 
+if TYPE_CHECKING:
+    from apolo_sdk import PluginManager
+
+
 APOLO_EXTRAS_UPGRADE = """\
 You are using apolo-extras tool {old_ver}, however {new_ver} is available.
 You should consider upgrading via the following command:
@@ -15,5 +19,5 @@ def get_apolo_extras_txt(old: str, new: str) -> str:
     return APOLO_EXTRAS_UPGRADE.format(old_ver=old, new_ver=new)
 
 
-def setup_plugin(manager: PluginManager) -> None:
+def setup_plugin(manager: "PluginManager") -> None:
     manager.version_checker.register("apolo-extras", get_apolo_extras_txt)
@@ -1,4 +1,6 @@
+import importlib
 import logging
+from typing import Any, Dict, List, Optional
 
 import click
 
@@ -14,7 +16,38 @@ class ClickLogHandler(logging.Handler):
             self.handleError(record)
 
 
-@click.group()
+class LazyGroup(click.Group):
+    """Group, which imports modules of its subcommands only when they are used"""
+
+    def __init__(
+        self,
+        *args: Any,
+        lazy_subcommands: Optional[Dict[str, str]] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        # subcommand name -> module, which registers the subcommand on import
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_subcommands})
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name not in self.commands and cmd_name in self.lazy_subcommands:
+            importlib.import_module(self.lazy_subcommands[cmd_name])
+        return super().get_command(ctx, cmd_name)
+
+
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "config": "apolo_extras.config",
+        "data": "apolo_extras.data",
+        "image": "apolo_extras.image",
+        "k8s": "apolo_extras.k8s",
+        "seldon": "apolo_extras.seldon",
+    },
+)
 @click.option(
     "-v",
     "--verbose",
@@ -1,9 +1,12 @@
 import asyncio
 import logging
 import os
+from dataclasses import replace
+from typing import List, Sequence
 
 import apolo_sdk
 import click
+from yarl import URL
 
 from .const import EX_OK, EX_PLATFORMERROR
 from .version import __version__
@@ -14,23 +17,66 @@ logger = logging.getLogger(__name__)
 APOLO_EXTRAS_IMAGE = os.environ.get(
     "APOLO_EXTRAS_IMAGE", f"ghcr.io/neuro-inc/apolo-extras:{__version__}"
 )
+# job output is written into stdout by lines, or by chunks of this size
+STDOUT_BUFFER_SIZE = 8 * 1024
 
 
 async def _attach_job_stdout(
-    job: apolo_sdk.JobDescription, client: apolo_sdk.Client, name: str = ""
+    job: apolo_sdk.JobDescription,
+    client: apolo_sdk.Client,
+    name: str = "",
+    initial_delay: float = 0.25,
+    max_delay: float = 2.0,
 ) -> int:
+    """Stream the job output into stdout and wait for the job to finish
+
+    The output is written as raw bytes, buffered up to the end of line.
+    The job status is polled with exponential backoff.
+    """
+    delay = initial_delay
     while job.status == apolo_sdk.JobStatus.PENDING:
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_delay)
         job = await client.jobs.status(job.id)
-        await asyncio.sleep(1.0)
+    stdout = click.get_binary_stream("stdout")
+    buf = bytearray()
     async for chunk in client.jobs.monitor(job.id):
         if not chunk:
             break
-        click.echo(chunk.decode(errors="ignore"), nl=False)
+        buf += chunk
+        if len(buf) >= STDOUT_BUFFER_SIZE or b"\n" in chunk:
+            stdout.write(buf)
+            stdout.flush()
+            buf.clear()
+    if buf:
+        stdout.write(buf)
+        stdout.flush()
+    return await _wait_job_finished(
+        job, client, name=name, initial_delay=initial_delay, max_delay=max_delay
+    )
+
+
+async def _wait_job_finished(
+    job: apolo_sdk.JobDescription,
+    client: apolo_sdk.Client,
+    name: str = "",
+    initial_delay: float = 0.5,
+    max_delay: float = 10.0,
+) -> int:
+    """Wait for the job to finish without reading its output
+
+    The job status is polled with exponential backoff.
+    """
+    delay = initial_delay
     while job.status in (apolo_sdk.JobStatus.PENDING, apolo_sdk.JobStatus.RUNNING):
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_delay)
         job = await client.jobs.status(job.id)
-        await asyncio.sleep(1.0)
+    return _get_job_exit_code(job, name=name)
+
 
-    job = await client.jobs.status(job.id)
+def _get_job_exit_code(job: apolo_sdk.JobDescription, name: str = "") -> int:
+    """Map the status of the finished job into exit code, logging failures"""
     exit_code = EX_PLATFORMERROR
     if job.status == apolo_sdk.JobStatus.SUCCEEDED:
         exit_code = EX_OK
@@ -44,3 +90,26 @@ async def _attach_job_stdout(
     else:
         logger.error(f"The {name} job {job.id} terminated, status: {job.status}")
     return exit_code
+
+
+def _replace_disk_name(disk_uri: URL, disk_id: str) -> URL:
+    """Replace the last part of disk uri (disk name or id) with disk_id"""
+    if disk_uri.path.endswith("/"):
+        disk_uri = disk_uri.with_path(disk_uri.path.rstrip("/"))
+    return disk_uri.parent / disk_id
+
+
+async def _resolve_disk_volumes(
+    disk_volumes: Sequence[apolo_sdk.DiskVolume], client: apolo_sdk.Client
+) -> List[apolo_sdk.DiskVolume]:
+    """Replace disk names in disk volumes with disk ids, resolved concurrently"""
+    # apolo_cli is only needed to resolve disks for the jobs
+    from apolo_cli.utils import resolve_disk
+
+    disk_ids = await asyncio.gather(
+        *(resolve_disk(disk.disk_uri, client=client) for disk in disk_volumes)
+    )
+    return [
+        replace(disk, disk_uri=_replace_disk_name(disk.disk_uri, disk_id))
+        for disk, disk_id in zip(disk_volumes, disk_ids)
+    ]
@@ -1,11 +1,10 @@
 import asyncio
-import json
 from typing import Optional
 
 import click
 
 from .cli import main
-from .image_builder import DockerConfigAuth, ImageBuilder
+from .image_builder import DockerConfig, DockerConfigAuth, ImageBuilder
 from .utils import get_platform_client
 
 
@@ -43,8 +42,8 @@ async def _save_registry_auth(path: str, cluster: Optional[str]) -> None:
         docker_config = await builder.create_docker_config()
         click.echo(f"Saving Docker config.json as {uri}")
         if uri.scheme == "file":
-            with open(path, "w") as f:
-                json.dump(docker_config.to_primitive(), f)
+            with open(path, "wb") as f:
+                f.write(docker_config.to_json_bytes())
         else:
             await builder.save_docker_config(docker_config, uri)
 
@@ -60,6 +59,5 @@ def build_registy_auth(registry_uri: str, username: str, password: str) -> None:
 
 
 def _build_registy_auth(registry_uri: str, username: str, password: str) -> str:
-    config = DockerConfigAuth(registry_uri, username, password)
-    result = {"auths": {registry_uri: {"auth": config.credentials}}}
-    return json.dumps(result)
+    auth = DockerConfigAuth(registry_uri, username, password)
+    return DockerConfig(auths=(auth,)).to_json_bytes().decode()
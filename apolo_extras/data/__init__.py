@@ -57,7 +57,10 @@ def data_transfer(source: str, destination: str) -> None:
         "Supported external object storage systems: "
         f"{list(SUPPORTED_OBJECT_STORAGE_SCHEMES.keys())}. "
         "Note: originally, Azure's blob storage scheme is 'http(s)', "
-        "but we prepend 'azure+' to differenciate https vs azure"
+        "but we prepend 'azure+' to differenciate https vs azure. "
+        "Set APOLO_EXTRAS_S3_SYNC=1 to copy S3 directories incrementally, "
+        "only transferring files missing in the DESTINATION "
+        "or differing from it in size or modification time."
     ),
 )
 @click.argument("source")
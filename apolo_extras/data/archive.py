@@ -1,7 +1,13 @@
 """Module for archive management operations (compression and extraction)"""
 
 import abc
+import itertools
 import logging
+import os
+import shutil
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Mapping, Optional, Tuple
 
 from ..utils import CLIRunner
 from .common import ArchiveType, Resource, ensure_folder_exists
@@ -9,6 +15,10 @@ from .common import ArchiveType, Resource, ensure_folder_exists
 
 logger = logging.getLogger(__name__)
 
+TAR_BLOCK_SIZE = 512
+# end of archive blocks, tar record padding and compression headers
+TAR_SIZE_MARGIN = 1024 * 1024
+
 
 class ArchiveManager(metaclass=abc.ABCMeta):
     """Interface for archive management"""
@@ -30,6 +40,34 @@ class TarManager(ArchiveManager, CLIRunner):
     async def compress(self, source: Resource, destination: Resource) -> Resource:
         """Compress source into destination using tar command"""
         command = "tar"
+        args = [
+            *self._get_compress_options(destination),
+            str(destination),
+            # f"--exclude={destination.filename}",
+            str(source),
+        ]
+        await self.run_command(command=command, args=args)
+        return destination
+
+    async def compress_stream(
+        self,
+        stream_command: Tuple[str, List[str]],
+        source: Resource,
+        destination: Resource,
+        stream_env: Optional[Mapping[str, str]] = None,
+    ) -> Resource:
+        """Compress source using tar command, piping the archive
+        into stdin of stream_command, which uploads it to destination"""
+        args = [*self._get_compress_options(destination), "-", str(source)]
+        await self.run_pipeline(
+            producer=("tar", args), consumer=stream_command, consumer_env=stream_env
+        )
+        return destination
+
+    @staticmethod
+    def _get_compress_options(destination: Resource) -> List[str]:
+        """Get tar options, which set the compression for destination,
+        the archive file name is expected to follow them"""
         if not destination.archive_type == ArchiveType.TAR:
             raise ValueError(
                 f"Can't compress into {destination.url} with TarManager: "
@@ -42,19 +80,39 @@ class TarManager(ArchiveManager, CLIRunner):
             ArchiveType.TAR_BZ: "jcvf",
             ArchiveType.TAR_PLAIN: "cvf",
         }
-        subcommand = mapping[destination.archive_type]
-        args = [
-            subcommand,
-            str(destination),
-            # f"--exclude={destination.filename}",
-            str(source),
-        ]
-        await self.run_command(command=command, args=args)
-        return destination
+        if destination.archive_type == ArchiveType.TAR_GZ and _pigz_available():
+            # compress on all available cores
+            return ["--use-compress-program=pigz", "-cvf"]
+        return [mapping[destination.archive_type]]
 
     async def extract(self, source: Resource, destination: Resource) -> Resource:
         """Extract source into destination using tar command"""
         command = "tar"
+        subcommand = self._get_extract_subcommand(source)
+        args = [subcommand, source.as_str(), f"-C", destination.as_str()]
+        destination.as_path().mkdir(exist_ok=True, parents=True)
+        await self.run_command(command=command, args=args)
+        return destination
+
+    async def extract_stream(
+        self,
+        stream_command: Tuple[str, List[str]],
+        source: Resource,
+        destination: Resource,
+        stream_env: Optional[Mapping[str, str]] = None,
+    ) -> Resource:
+        """Extract source, written into stdout of stream_command,
+        into destination using tar command"""
+        subcommand = self._get_extract_subcommand(source)
+        args = [subcommand, "-", "-C", destination.as_str()]
+        destination.as_path().mkdir(exist_ok=True, parents=True)
+        await self.run_pipeline(
+            producer=stream_command, consumer=("tar", args), producer_env=stream_env
+        )
+        return destination
+
+    @staticmethod
+    def _get_extract_subcommand(source: Resource) -> str:
         if not source.archive_type == ArchiveType.TAR:
             raise ValueError(
                 f"Can't extract {source} with TarManager: "
@@ -67,19 +125,16 @@ class TarManager(ArchiveManager, CLIRunner):
             ArchiveType.TAR_BZ: "jxvf",
             ArchiveType.TAR_PLAIN: "xvf",
         }
-        subcommand = mapping[source.archive_type]
-        args = [subcommand, source.as_str(), f"-C", destination.as_str()]
-        destination.as_path().mkdir(exist_ok=True, parents=True)
-        await self.run_command(command=command, args=args)
-        return destination
+        return mapping[source.archive_type]
 
 
 class GzipManager(ArchiveManager, CLIRunner):
     """Utility class for handling gzip archives"""
 
     async def compress(self, source: Resource, destination: Resource) -> Resource:
-        """Compress source into destination using gzip command"""
-        command = "gzip"
+        """Compress source into destination using gzip command
+        (or its parallel implementation pigz, if it's installed)"""
+        command = "pigz" if _pigz_available() else "gzip"
         if not destination.archive_type == ArchiveType.GZ:
             raise ValueError(
                 f"Can't compress into {destination} with GzipManager: "
@@ -153,6 +208,12 @@ class ZipManager(ArchiveManager, CLIRunner):
         return destination
 
 
+@lru_cache(maxsize=None)
+def _pigz_available() -> bool:
+    """Check if pigz, parallel implementation of gzip, is installed"""
+    return shutil.which("pigz") is not None
+
+
 def _get_archive_manager(archive: Resource) -> ArchiveManager:
     """Resolve appropriate archive manager"""
     mapping = {
@@ -160,7 +221,7 @@ def _get_archive_manager(archive: Resource) -> ArchiveManager:
         ArchiveType.GZ: GzipManager(),
         ArchiveType.ZIP: ZipManager(),
     }
-    archive_type = ArchiveType.get_type(archive.as_path())
+    archive_type = archive.archive_type
     if archive_type == ArchiveType.UNSUPPORTED:
         supported_extensions = list(ArchiveType.get_extension_mapping())
         raise ValueError(
@@ -170,6 +231,17 @@ def _get_archive_manager(archive: Resource) -> ArchiveManager:
     return next(manager for type, manager in mapping.items() if type == archive_type)
 
 
+def _is_same_archive_type(source: Resource, destination: Resource) -> bool:
+    """Check if both source and destination are archives of the same type"""
+    if source.filename is None or destination.filename is None:
+        return False
+    both_archives = ArchiveType.UNSUPPORTED not in (
+        source.archive_type,
+        destination.archive_type,
+    )
+    return both_archives and source.archive_type == destination.archive_type
+
+
 async def copy(source: Resource, destination: Resource) -> Resource:
     """Copy source into destination"""
     command = "cp"
@@ -183,18 +255,11 @@ async def compress(source: Resource, destination: Resource) -> Resource:
     """Compress source into destination while
     inferring arhive type from destination"""
     ensure_folder_exists(destination)
-    if source.filename is not None and destination.filename is not None:
-        both_archives = ArchiveType.UNSUPPORTED not in (
-            source.archive_type,
-            destination.archive_type,
+    if _is_same_archive_type(source, destination):
+        logger.info(
+            "Skipping compression step - source is already archive of the same type"
         )
-        same_type = source.archive_type == destination.archive_type
-        if both_archives and same_type:
-            logger.info(
-                "Skipping compression step - "
-                "source is already archive of the same type"
-            )
-            return await copy(source=source, destination=destination)
+        return await copy(source=source, destination=destination)
 
     manager_implementation = _get_archive_manager(destination)
     logger.debug(
@@ -215,3 +280,76 @@ async def extract(source: Resource, destination: Resource) -> Resource:
         f"with {manager_implementation.__class__.__name__}"
     )
     return await manager_implementation.extract(source=source, destination=destination)
+
+
+def can_extract_stream(archive: Resource) -> bool:
+    """Check if archive can be extracted while it is being downloaded"""
+    return archive.archive_type == ArchiveType.TAR
+
+
+def can_compress_stream(source: Resource, destination: Resource) -> bool:
+    """Check if source can be compressed while the archive is being uploaded"""
+    return destination.archive_type == ArchiveType.TAR and not _is_same_archive_type(
+        source, destination
+    )
+
+
+async def compress_stream(
+    stream_command: Tuple[str, List[str]],
+    source: Resource,
+    destination: Resource,
+    stream_env: Optional[Mapping[str, str]] = None,
+) -> Resource:
+    """Compress source, piping the archive into stdin of stream_command
+
+    Only tar archives can be compressed into a stream.
+    """
+    logger.debug(f"Compressing {source} into {destination} while uploading it")
+    return await TarManager().compress_stream(
+        stream_command=stream_command,
+        source=source,
+        destination=destination,
+        stream_env=stream_env,
+    )
+
+
+def max_tar_size(path: Path) -> int:
+    """Get the upper bound of the size of (compressed) tar archive of the path
+
+    Each entry takes a header block and its data padded to whole blocks,
+    compression may grow incompressible data by a fraction of a percent.
+    """
+    size = _tar_entry_size(path.lstat().st_size)
+    for root, dirs, files in os.walk(path):
+        for name in itertools.chain(dirs, files):
+            try:
+                size += _tar_entry_size(os.lstat(os.path.join(root, name)).st_size)
+            except OSError:
+                # removed while being walked, tar will skip it as well
+                pass
+    return size + size // 100 + TAR_SIZE_MARGIN
+
+
+def _tar_entry_size(file_size: int) -> int:
+    """Get the size of the file in tar archive"""
+    return TAR_BLOCK_SIZE + -(-file_size // TAR_BLOCK_SIZE) * TAR_BLOCK_SIZE
+
+
+async def extract_stream(
+    stream_command: Tuple[str, List[str]],
+    source: Resource,
+    destination: Resource,
+    stream_env: Optional[Mapping[str, str]] = None,
+) -> Resource:
+    """Extract source, written into stdout of stream_command, into destination
+
+    Only tar archives can be extracted from a stream.
+    """
+    ensure_folder_exists(destination)
+    logger.debug(f"Extracting {source} into {destination} while downloading it")
+    return await TarManager().extract_stream(
+        stream_command=stream_command,
+        source=source,
+        destination=destination,
+        stream_env=stream_env,
+    )
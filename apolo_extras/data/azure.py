@@ -2,6 +2,8 @@
 
 import logging
 import os
+from functools import lru_cache
+from typing import List, Optional, Tuple
 from urllib import parse
 
 from yarl import URL
@@ -12,6 +14,13 @@ from .common import Copier, DataUrlType, Resource
 
 logger = logging.getLogger(__name__)
 
+# rclone defaults to 4 parallel transfers, which underutilizes
+# the connection when copying directories with lots of small files
+AZURE_DIRECTORY_TRANSFERS = 16
+# single blobs above the cutoff are downloaded in parallel byte ranges
+AZURE_DOWNLOAD_STREAMS = 8
+AZURE_DOWNLOAD_STREAMS_CUTOFF = "64M"
+
 
 class AzureCopier(Copier, CLIRunner):
     """Copier, that is capable of copying to/from Azure storage"""
@@ -42,27 +51,68 @@ class AzureCopier(Copier, CLIRunner):
         source = _patch_azure_url_for_rclone(self.source.url)
         destination = _patch_azure_url_for_rclone(self.destination.url)
         command = "rclone"
-        args = ["copyto", "-v", "--azureblob-sas-url", sas_url, source, destination]
+        args = ["copyto", "-v", "--azureblob-sas-url", sas_url]
+        if self.source.filename is None:
+            # many small blobs are latency-bound, copy more of them at once
+            args += [
+                f"--transfers={AZURE_DIRECTORY_TRANSFERS}",
+                f"--checkers={AZURE_DIRECTORY_TRANSFERS}",
+            ]
+        elif self.destination.data_url_type == DataUrlType.LOCAL_FS:
+            # download large blob by byte ranges over several connections
+            args += [
+                f"--multi-thread-streams={AZURE_DOWNLOAD_STREAMS}",
+                f"--multi-thread-cutoff={AZURE_DOWNLOAD_STREAMS_CUTOFF}",
+            ]
+        args += [source, destination]
         await self.run_command(command=command, args=args)
         return self.destination
 
+    def get_download_stream_command(self) -> Optional[Tuple[str, List[str]]]:
+        """Stream Azure blob into stdout through rclone"""
+        if (
+            self.source.data_url_type != DataUrlType.AZURE
+            or self.source.filename is None
+        ):
+            return None
+        sas_url = _build_sas_url(self.source.url)
+        source = _patch_azure_url_for_rclone(self.source.url)
+        return "rclone", ["cat", "--azureblob-sas-url", sas_url, source]
+
+    def get_upload_stream_command(
+        self, expected_size: Optional[int] = None
+    ) -> Optional[Tuple[str, List[str]]]:
+        """Stream stdin into Azure blob through rclone"""
+        if (
+            self.destination.data_url_type != DataUrlType.AZURE
+            or self.destination.filename is None
+        ):
+            return None
+        sas_url = _build_sas_url(self.destination.url)
+        destination = _patch_azure_url_for_rclone(self.destination.url)
+        return "rclone", ["rcat", "--azureblob-sas-url", sas_url, destination]
+
 
 def _build_sas_url(azure_url: URL) -> str:
     """
     In order to build SAS URL we replace original URL scheme with HTTPS,
     remove everything from path except bucket name and append SAS token as a query
     """
-    sas_token = os.getenv("AZURE_SAS_TOKEN", "")
+    bucket_path = "/".join(azure_url.path.split("/")[:2])
+    return _build_bucket_sas_url(
+        str(azure_url.origin()), bucket_path, os.getenv("AZURE_SAS_TOKEN", "")
+    )
+
+
+@lru_cache(maxsize=128)
+def _build_bucket_sas_url(origin: str, bucket_path: str, sas_token: str) -> str:
+    """Build SAS URL once per bucket, since urls of all blobs map into it"""
     if not sas_token:
         logger.warning("AZURE_SAS_TOKEN env is not provided")
-    quoted_url = (
-        azure_url.with_scheme("https")
-        .with_path("/".join(azure_url.path.split("/")[:2]))
-        .with_query(sas_token)
-    )
+    quoted_url = URL(origin).with_scheme("https").with_path(bucket_path)
     # with_query performs urlencode of sas_token, which breaks the token,
     # so we urldecode the resulting url
-    sas_url = parse.unquote(str(quoted_url))
+    sas_url = parse.unquote(str(quoted_url.with_query(sas_token)))
     logger.debug(f"SAS URL: {sas_url}")
     return sas_url
 
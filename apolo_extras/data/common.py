@@ -6,10 +6,9 @@ import os
 import re
 from dataclasses import dataclass
 from enum import Flag, auto
-from functools import cached_property
+from functools import cached_property, lru_cache
 from pathlib import Path
-from tempfile import TemporaryDirectory
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, ClassVar, Dict, List, Mapping, Optional, Tuple, Union
 
 from apolo_sdk import Client
 from yarl import URL
@@ -17,6 +16,9 @@ from yarl import URL
 
 logger = logging.getLogger(__name__)
 
+# :ro or :rw mount mode flag at the end of platform urls
+_MODE_FLAG_RE = re.compile(r":(rw|ro)$")
+
 
 class ArchiveType(int, Flag):  # type: ignore
     """Int Flag for archive types
@@ -40,9 +42,7 @@ class ArchiveType(int, Flag):  # type: ignore
         """Get list of file extensions, that correspond
         to the provided archive type"""
         return [
-            ext
-            for ext, type_ in ArchiveType.get_extension_mapping().items()
-            if type_ == type
+            ext for ext, type_ in _ARCHIVE_TYPE_BY_EXTENSION.items() if type_ == type
         ]
 
     @staticmethod
@@ -70,17 +70,34 @@ class ArchiveType(int, Flag):  # type: ignore
     @staticmethod
     def get_type(archive: Path) -> "ArchiveType":
         """Determine archive type from file extension"""
-        suffixes = archive.suffixes[-2:]  # keep only at most 2 suffixes
-        if not suffixes:
-            return ArchiveType.UNSUPPORTED
-        if "".join(suffixes) in ArchiveType.get_extension_mapping():
-            # match longest possible suffix first
-            return ArchiveType.get_extension_mapping()["".join(suffixes)]
-        else:
-            # try to match last suffix
-            return ArchiveType.get_extension_mapping().get(
-                suffixes[-1], ArchiveType.UNSUPPORTED
-            )
+        return _archive_type_of(archive.name)
+
+
+# lookup tables are built once, rather than on each get_*_mapping call
+_ARCHIVE_TYPE_BY_EXTENSION = ArchiveType.get_extension_mapping()
+
+
+@lru_cache(maxsize=1024)
+def _archive_type_of(filename: str) -> ArchiveType:
+    """Determine archive type from extension of the file name
+
+    Follows Path.suffixes semantics without constructing Path objects:
+    at most 2 last suffixes are considered, the longest match wins.
+    """
+    if filename.endswith("."):
+        return ArchiveType.UNSUPPORTED
+    stem, dot, last_suffix = filename.lstrip(".").rpartition(".")
+    if not dot:
+        return ArchiveType.UNSUPPORTED
+    mapping = _ARCHIVE_TYPE_BY_EXTENSION
+    _, dot, previous_suffix = stem.rpartition(".")
+    if dot:
+        # match longest possible suffix first
+        archive_type = mapping.get(f".{previous_suffix}.{last_suffix}")
+        if archive_type is not None:
+            return archive_type
+    # try to match last suffix
+    return mapping.get(f".{last_suffix}", ArchiveType.UNSUPPORTED)
 
 
 class DataUrlType(int, Flag):  # type: ignore
@@ -128,19 +145,25 @@ class DataUrlType(int, Flag):  # type: ignore
         }
 
     @staticmethod
+    @lru_cache(maxsize=1024)
     def get_type(url: Union[str, URL]) -> "DataUrlType":
         """Detect UrlType by checking url schema"""
-        scheme_mapping = DataUrlType.get_scheme_mapping()
         if isinstance(url, URL):
             url_scheme = url.scheme
         else:
             url_scheme = URL(url).scheme
-        return scheme_mapping.get(url_scheme, DataUrlType.COPY_UNSUPPORTED)
+        return _URL_TYPE_BY_SCHEME.get(url_scheme, DataUrlType.COPY_UNSUPPORTED)
+
+
+_URL_TYPE_BY_SCHEME = DataUrlType.get_scheme_mapping()
 
 
 class Copier(metaclass=abc.ABCMeta):
     """Base interface for copying data between a variety of sources"""
 
+    # whether get_upload_stream_command makes use of expected_size
+    uses_expected_size: ClassVar[bool] = False
+
     def __init__(self, source: "Resource", destination: "Resource") -> None:
         self.source = source
         self.destination = destination
@@ -155,6 +178,32 @@ class Copier(metaclass=abc.ABCMeta):
         and return path to the copied resource"""
         raise NotImplementedError
 
+    def get_download_stream_command(self) -> Optional[Tuple[str, List[str]]]:
+        """Get command (and its args), which writes contents
+        of self.source into stdout
+
+        Returns None if the copier can't stream the source.
+        """
+        return None
+
+    def get_upload_stream_command(
+        self, expected_size: Optional[int] = None
+    ) -> Optional[Tuple[str, List[str]]]:
+        """Get command (and its args), which writes contents
+        of stdin into self.destination
+
+        expected_size is the upper bound of the size of the contents, if known.
+        Returns None if the copier can't stream into the destination.
+        """
+        return None
+
+    def get_stream_env(self) -> Optional[Mapping[str, str]]:
+        """Get environment of the stream commands
+
+        Returns None if the commands inherit the environment.
+        """
+        return None
+
 
 @dataclass(frozen=True)
 class Resource:
@@ -177,7 +226,7 @@ class Resource:
 
     @cached_property
     def archive_type(self) -> ArchiveType:
-        result = ArchiveType.get_type(archive=Path(self.url.path))
+        result = _archive_type_of(self.url.path.rstrip("/").rpartition("/")[2])
         logger.debug(f"Archive type of {self.url}: {result.name}")
         return result
 
@@ -185,22 +234,18 @@ class Resource:
     def filename(self) -> Optional[str]:
         """Filename to which the url is pointing
 
-        For local urls, this is obtained from os.path.split
+        For local urls, this is the name of the path
         For platform urls this is obtained by detecting cluster/org/project name,
           if the url points to a project/org/cluster (without trailing slash),
           the filename will be None.
         For all other urls - the last part of self.url.parts is returned
         """
         if self.data_url_type == DataUrlType.LOCAL_FS:
-            # use pathlib
-            _, tail = os.path.split(self.as_path())
-            result = tail if tail else None
+            result = self.as_path().name or None
 
         elif self.data_url_type in (DataUrlType.DISK, DataUrlType.STORAGE):
             assert self._client is not None
-            normalized_url = self._client.parse.normalize_uri(
-                self.strip_mount_mode_flag().url
-            )
+            normalized_url = self._normalized_url
             parts = normalized_url.parts
             # during normaliziation at least current project is present
             assert len(parts) >= 2
@@ -233,6 +278,13 @@ class Resource:
         logger.debug(f"Filename of {self.url} ({self.data_url_type.name}): {result}")
         return result
 
+    @cached_property
+    def _normalized_url(self) -> URL:
+        """Normalized url of the platform resource without mount mode flag,
+        shared by filename and disk_id_and_path"""
+        assert self._client is not None
+        return self._client.parse.normalize_uri(self.strip_mount_mode_flag().url)
+
     @cached_property
     def disk_id_and_path(self) -> Tuple[str, Optional[str]]:
         """For disk resources - full id of the disk
@@ -242,9 +294,7 @@ class Resource:
         """
         assert self.data_url_type == DataUrlType.DISK
         assert self._client is not None
-        normalized_url = self._client.parse.normalize_uri(
-            self.strip_mount_mode_flag().url
-        )
+        normalized_url = self._normalized_url
         parts = normalized_url.parts
         # during normaliziation at least current project and disk id is present
         assert len(parts) >= 3
@@ -306,7 +356,8 @@ class Resource:
             logger.debug(f"{self.url} has no fileneme")
             return self
         result = Resource.from_str(
-            re.sub(pattern=f"{self.filename}$", repl="", string=self.as_str()),
+            # plain suffix, since file names may contain regex special chars
+            self.as_str().removesuffix(self.filename),
             _client=self._client,
         )
         logger.debug(f"Stripped filename from {self.url} to {result.url}")
@@ -318,7 +369,7 @@ class Resource:
         if self.data_url_type not in (DataUrlType.DISK, DataUrlType.STORAGE):
             logger.debug(f"{self.url} ({self.data_url_type=}) has no mode flag.")
             return None
-        match = re.search(pattern=f":(rw|ro)$", string=self.as_str())
+        match = _MODE_FLAG_RE.search(self.as_str())
         if match:
             result = match.group(1)
             logger.debug(f"Mode flag of {self.url}: {result}")
@@ -329,7 +380,7 @@ class Resource:
     def strip_mount_mode_flag(self) -> "Resource":
         if self.data_url_type in (DataUrlType.DISK, DataUrlType.STORAGE):
             return Resource.from_str(
-                re.sub(pattern="(:ro|:rw)$", repl="", string=self.as_str()),
+                _MODE_FLAG_RE.sub("", self.as_str()),
                 _client=self._client,
             )
         return self
@@ -340,16 +391,3 @@ def ensure_folder_exists(local_resource: Resource) -> None:
     folder_name, _ = os.path.split(local_resource.as_str())
     logger.info(f"Creating folder for {folder_name}")
     Path(folder_name).mkdir(exist_ok=True, parents=True)
-
-
-def get_default_preset(apolo_client: Client) -> str:
-    """Get default preset name via Neu.ro client"""
-    return next(iter(apolo_client.presets.keys()))
-
-
-def provide_temp_dir(
-    dir: Path = Path.home() / ".neuro-tmp",
-) -> TemporaryDirectory:  # type: ignore
-    """Provide temp directory"""
-    dir.mkdir(exist_ok=True, parents=True)
-    return TemporaryDirectory(dir=dir)
@@ -1,12 +1,20 @@
 """Module for copying files on local filesystem"""
 
+import asyncio
+import errno
+import logging
 import os
+import shutil
+import sys
 from pathlib import Path
 
 from ..utils import CLIRunner
 from .common import Copier, DataUrlType, Resource
 
 
+logger = logging.getLogger(__name__)
+
+
 class LocalFSCopier(Copier, CLIRunner):
     """Copier implementation for local file system operations"""
 
@@ -18,10 +26,22 @@ class LocalFSCopier(Copier, CLIRunner):
             raise ValueError("Only local filesystem is supported")
 
     async def perform_copy(self) -> Resource:
-        """Perform copy through running rclone and return the url to destinaton"""
+        """Perform copy through running rclone and return the url to destinaton
+
+        Single regular files are copied in-kernel without spawning rclone.
+        """
         destination_path = Path(self.destination.url.path)
         destination_parent_folder, _ = os.path.split(destination_path)
         Path(destination_parent_folder).mkdir(exist_ok=True, parents=True)
+        source_path = self.source.as_path()
+        if (
+            source_path.is_file()
+            and not self.destination.as_str().endswith("/")
+            and not destination_path.is_dir()
+        ):
+            logger.info(f"Copying file {source_path} into {destination_path}")
+            await asyncio.to_thread(_copy_file, source_path, destination_path)
+            return self.destination
         command = "rclone"
         args = [
             "copyto",  # TODO: investigate usage of 'sync' for potential speedup.
@@ -33,3 +53,47 @@ class LocalFSCopier(Copier, CLIRunner):
         ]
         await self.run_command(command=command, args=args)
         return self.destination
+
+
+def _copy_file(source: Path, destination: Path) -> None:
+    """Copy regular file with its metadata
+
+    On Linux the destination is preallocated and the contents are
+    transferred with sendfile(2), avoiding copies through user space.
+    Elsewhere shutil.copy2 is used, which relies on fcopyfile(3) on macOS.
+    Like shutil.copy2, refuses to copy the file onto itself.
+    """
+    # opening the destination for writing would truncate the source
+    if destination.exists() and os.path.samefile(source, destination):
+        raise shutil.SameFileError(f"{source} and {destination} are the same file")
+    if sys.platform != "linux":
+        shutil.copy2(source, destination)
+        return
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        size = os.fstat(src.fileno()).st_size
+        _preallocate(dst.fileno(), size)
+        offset = 0
+        try:
+            while offset < size:
+                sent = os.sendfile(dst.fileno(), src.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except OSError as e:
+            if offset or e.errno not in (errno.EINVAL, errno.ENOSYS, errno.ENOTSOCK):
+                raise
+            # file-to-file sendfile is not supported by the kernel or filesystem
+            shutil.copyfileobj(src, dst)
+    shutil.copystat(source, destination)
+
+
+def _preallocate(fd: int, size: int) -> None:
+    """Reserve disk space for the file of known size in a single call,
+    so it is not extended block by block while being written"""
+    if size == 0 or not hasattr(os, "posix_fallocate"):
+        return
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except OSError as e:
+        # not every filesystem supports preallocation, it's only an optimization
+        logger.debug(f"Unable to preallocate {size} bytes: {e}")
@@ -1,5 +1,7 @@
 """Module for copying files from/to Google Cloud Storage"""
 
+from typing import List, Optional, Tuple
+
 from ..utils import CLIRunner
 from .common import Copier, DataUrlType, Resource
 
@@ -27,3 +29,20 @@ class GCSCopier(Copier, CLIRunner):
         args = ["-m", "cp", "-r", str(self.source.url), str(self.destination.url)]
         await self.run_command(command=command, args=args)
         return self.destination
+
+    def get_download_stream_command(self) -> Optional[Tuple[str, List[str]]]:
+        """Stream GCS object into stdout through gsutil"""
+        if self.source.data_url_type != DataUrlType.GCS or self.source.filename is None:
+            return None
+        return "gsutil", ["cp", str(self.source.url), "-"]
+
+    def get_upload_stream_command(
+        self, expected_size: Optional[int] = None
+    ) -> Optional[Tuple[str, List[str]]]:
+        """Stream stdin into GCS object through gsutil"""
+        if (
+            self.destination.data_url_type != DataUrlType.GCS
+            or self.destination.filename is None
+        ):
+            return None
+        return "gsutil", ["cp", "-", str(self.destination.url)]
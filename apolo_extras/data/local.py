@@ -6,16 +6,27 @@ Contains:
 - CloudToLocalCopier
 """
 
+import asyncio
 import logging
 import os
 import tempfile
+from functools import cached_property
 from pathlib import Path
-from typing import Type
+from typing import Awaitable, Callable, ClassVar, Dict, Tuple, Type
 
 from apolo_extras.data.fs import LocalFSCopier
 from apolo_extras.data.web import WebCopier
 
-from .archive import ArchiveType, compress, extract
+from .archive import (
+    ArchiveType,
+    can_compress_stream,
+    can_extract_stream,
+    compress,
+    compress_stream,
+    extract,
+    extract_stream,
+    max_tar_size,
+)
 from .azure import AzureCopier
 from .common import Copier, DataUrlType, Resource, ensure_folder_exists
 from .gcs import GCSCopier
@@ -24,10 +35,22 @@ from .s3 import S3Copier
 
 logger = logging.getLogger(__name__)
 
+_COPIER_BY_URL_TYPE: Dict[DataUrlType, Type[Copier]] = {
+    DataUrlType.S3: S3Copier,
+    DataUrlType.AZURE: AzureCopier,
+    DataUrlType.GCS: GCSCopier,
+    DataUrlType.HTTP: WebCopier,
+    DataUrlType.HTTPS: WebCopier,
+    DataUrlType.LOCAL_FS: LocalFSCopier,
+}
+
 
 class BaseLocalCopier(Copier):
     """Base class for copiers, which can be executed locally"""
 
+    # names of methods implementing the copy for each (extract, compress) pair
+    _copy_implementations: ClassVar[Dict[Tuple[bool, bool], str]]
+
     def __init__(
         self,
         source: Resource,
@@ -40,21 +63,38 @@ class BaseLocalCopier(Copier):
         self.compress = compress
         self.extract = extract
         self.temp_dir = temp_dir
+        self.temp_dir.mkdir(exist_ok=True, parents=True)
+        self._perform_copy_impl: Callable[[], Awaitable[Resource]] = getattr(
+            self, self._copy_implementations[(extract, compress)]
+        )
+
+    @cached_property
+    def _extraction_dir(self) -> Path:
+        """Folder inside temp_dir for intermediate extraction results"""
+        path = self.temp_dir / "extracted"
+        path.mkdir(exist_ok=True, parents=True)
+        return path
+
+    @cached_property
+    def _recompression_dir(self) -> Path:
+        """Folder inside temp_dir for intermediate recompression results"""
+        path = self.temp_dir / "recompressed"
+        path.mkdir(exist_ok=True, parents=True)
+        return path
+
+    @cached_property
+    def _download_dir(self) -> Path:
+        """Folder inside temp_dir for downloaded source folders"""
+        path = self.temp_dir / "source"
+        path.mkdir(exist_ok=True, parents=True)
+        return path
 
     @staticmethod
     def get_copier(
         source: Resource, destination: Resource, type: DataUrlType
     ) -> Copier:
         """Get copier of proper type to copy from"""
-        destination_copier_mapping = {
-            DataUrlType.S3: S3Copier,
-            DataUrlType.AZURE: AzureCopier,
-            DataUrlType.GCS: GCSCopier,
-            DataUrlType.HTTP: WebCopier,
-            DataUrlType.HTTPS: WebCopier,
-            DataUrlType.LOCAL_FS: LocalFSCopier,
-        }
-        cls: Type[Copier] = destination_copier_mapping[type]
+        cls: Type[Copier] = _COPIER_BY_URL_TYPE[type]
         return cls(source=source, destination=destination)
 
     def _can_skip_recompression(self) -> bool:
@@ -88,6 +128,13 @@ class LocalToLocalCopier(BaseLocalCopier):
     Supports compression and extraction.
     """
 
+    _copy_implementations = {
+        (True, True): "_recompress",
+        (True, False): "_extract",
+        (False, True): "_compress",
+        (False, False): "_copy",
+    }
+
     def _ensure_can_execute(self) -> None:
         if not (
             self.source.data_url_type == DataUrlType.LOCAL_FS
@@ -106,10 +153,9 @@ class LocalToLocalCopier(BaseLocalCopier):
                 "source and destination are archives of the same type"
             )
             return await self._copy()
-        temp_extraction_destination = self.temp_dir / "extracted"
         extracted_folder = await extract(
             source=self.source,
-            destination=Resource.from_path(temp_extraction_destination),
+            destination=Resource.from_path(self._extraction_dir),
         )
 
         new_archive = await compress(
@@ -150,14 +196,7 @@ class LocalToLocalCopier(BaseLocalCopier):
         Uses ArchiveManager to handle compression/extraction.
         """
         ensure_folder_exists(self.destination)
-        if self.extract and self.compress:
-            return await self._recompress()
-        elif self.extract:
-            return await self._extract()
-        elif self.compress:
-            return await self._compress()
-        else:
-            return await self._copy()
+        return await self._perform_copy_impl()
 
 
 class LocalToCloudCopier(BaseLocalCopier):
@@ -166,6 +205,13 @@ class LocalToCloudCopier(BaseLocalCopier):
     Supports compression and extraction (temp_dir is used to store intermediate results)
     """
 
+    _copy_implementations = {
+        (True, True): "_recompress_and_copy",
+        (True, False): "_extract_and_copy",
+        (False, True): "_compress_and_copy",
+        (False, False): "_copy",
+    }
+
     def _ensure_can_execute(self) -> None:
         if not (
             self.source.data_url_type == DataUrlType.LOCAL_FS
@@ -184,8 +230,8 @@ class LocalToCloudCopier(BaseLocalCopier):
                 "source and destination are archives of the same type"
             )
             return await self._copy()
-        temp_archive = (
-            self.temp_dir / "recompressed" / self.destination.filename  # type: ignore
+        temp_archive: Path = (
+            self._recompression_dir / self.destination.filename  # type: ignore
         )
         local_copier = LocalToLocalCopier(
             source=self.source,
@@ -222,6 +268,26 @@ class LocalToCloudCopier(BaseLocalCopier):
             raise ValueError(
                 f"Can't infer archive type from destination {self.destination}"
             )
+        if can_compress_stream(source=self.source, destination=self.destination):
+            copier = BaseLocalCopier.get_copier(
+                source=self.source,
+                destination=self.destination,
+                type=self.destination.data_url_type,
+            )
+            expected_size = None
+            if copier.uses_expected_size:
+                # lets the upload pick large enough parts for the whole archive
+                expected_size = await asyncio.to_thread(
+                    max_tar_size, self.source.as_path()
+                )
+            stream_command = copier.get_upload_stream_command(expected_size)
+            if stream_command is not None:
+                return await compress_stream(
+                    stream_command=stream_command,
+                    source=self.source,
+                    destination=self.destination,
+                    stream_env=copier.get_stream_env(),
+                )
         compressed_file = await compress(
             source=self.source,
             destination=Resource.from_path(self.temp_dir / self.destination.filename),
@@ -247,14 +313,7 @@ class LocalToCloudCopier(BaseLocalCopier):
         Delegates copy implementation to appropriate Copier (S3, Azure, GCS, Web).
         Uses ArchiveManager to handle compression/extraction.
         """
-        if self.extract and self.compress:
-            return await self._recompress_and_copy()
-        elif self.extract:
-            return await self._extract_and_copy()
-        elif self.compress:
-            return await self._compress_and_copy()
-        else:
-            return await self._copy()
+        return await self._perform_copy_impl()
 
 
 class CloudToLocalCopier(BaseLocalCopier):
@@ -263,6 +322,13 @@ class CloudToLocalCopier(BaseLocalCopier):
     Supports compression and extraction (temp_dir is used to store intermediate results)
     """
 
+    _copy_implementations = {
+        (True, True): "_copy_and_recompress",
+        (True, False): "_copy_and_extract",
+        (False, True): "_copy_and_compress",
+        (False, False): "_copy",
+    }
+
     def _ensure_can_execute(self) -> None:
         if not (
             self.source.data_url_type == DataUrlType.CLOUD
@@ -302,6 +368,20 @@ class CloudToLocalCopier(BaseLocalCopier):
     async def _copy_and_extract(self) -> Resource:
         if self.source.filename is None:
             raise ValueError(f"Can't infer archive type from source {self.source}")
+        if can_extract_stream(self.source):
+            copier = BaseLocalCopier.get_copier(
+                source=self.source,
+                destination=self.destination,
+                type=self.source.data_url_type,
+            )
+            stream_command = copier.get_download_stream_command()
+            if stream_command is not None:
+                return await extract_stream(
+                    stream_command=stream_command,
+                    source=self.source,
+                    destination=self.destination,
+                    stream_env=copier.get_stream_env(),
+                )
         temp_archive = self.temp_dir / self.source.filename
         copier_implementation = BaseLocalCopier.get_copier(
             source=self.source,
@@ -317,12 +397,10 @@ class CloudToLocalCopier(BaseLocalCopier):
             raise ValueError(
                 f"Can't infer archive type from destination {self.destination}"
             )
-        self.temp_dir.mkdir(exist_ok=True, parents=True)
         if self.source.filename:
             destination_path = str(self.temp_dir / self.source.filename)
         else:
-            (self.temp_dir / "source").mkdir(exist_ok=True, parents=True)
-            destination_path = str(self.temp_dir / "source") + os.sep
+            destination_path = str(self._download_dir) + os.sep
         copier_implementation = BaseLocalCopier.get_copier(
             source=self.source,
             destination=Resource.from_str(destination_path),
@@ -344,11 +422,4 @@ class CloudToLocalCopier(BaseLocalCopier):
 
     async def perform_copy(self) -> Resource:
         ensure_folder_exists(self.destination)
-        if self.extract and self.compress:
-            return await self._copy_and_recompress()
-        elif self.extract:
-            return await self._copy_and_extract()
-        elif self.compress:
-            return await self._copy_and_compress()
-        else:
-            return await self._copy()
+        return await self._perform_copy_impl()
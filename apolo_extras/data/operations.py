@@ -5,14 +5,20 @@ Provides:
 """
 
 import logging
+from functools import partial
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Type
 
 from apolo_sdk import Client
 
 from ..utils import provide_temp_dir
 from .common import Copier, DataUrlType, Resource
-from .local import CloudToLocalCopier, LocalToCloudCopier, LocalToLocalCopier
+from .local import (
+    BaseLocalCopier,
+    CloudToLocalCopier,
+    LocalToCloudCopier,
+    LocalToLocalCopier,
+)
 from .remote import RemoteCopier
 
 
@@ -25,6 +31,21 @@ class CopyOperation:
     """Abstraction of data copying between two locations
     with support for compression and extraction"""
 
+    __slots__ = (
+        "client",
+        "source",
+        "destination",
+        "source_type",
+        "destination_type",
+        "compress",
+        "extract",
+        "volumes",
+        "env",
+        "life_span",
+        "preset",
+        "_copier_factory",
+    )
+
     def __init__(
         self,
         source: str,
@@ -40,6 +61,8 @@ class CopyOperation:
         self.client = client
         self.source = Resource.parse(source, client=client)
         self.destination = Resource.parse(destination, client=client)
+        self.source_type = self.source.data_url_type
+        self.destination_type = self.destination.data_url_type
         self.compress = compress
         self.extract = extract
         self.volumes = volumes
@@ -47,6 +70,17 @@ class CopyOperation:
         self.life_span = life_span
         self.preset = preset
         self._ensure_can_execute()
+        self._copier_factory = _bind_copier_factory(
+            source=self.source,
+            destination=self.destination,
+            compress=compress,
+            extract=extract,
+            client=client,
+            volumes=volumes,
+            env=env,
+            preset=preset,
+            life_span=life_span,
+        )
 
     def _ensure_can_execute(self) -> None:
         """Raise exception if operation is unsupported
@@ -59,26 +93,17 @@ class CopyOperation:
             raise ValueError(f"Unsupported source: {self.source}")
         if not self.destination.data_copy_supported:
             raise ValueError(f"Unsupported destination: {self.destination}")
-        source_type = DataUrlType.get_type(self.source.url)
-        destination_type = DataUrlType.get_type(self.destination.url)
-        is_forbidden_combination = any(
-            (
-                self.source.data_url_type == source
-                and self.destination.data_url_type == destination
-            )
-            for (source, destination) in CopyOperation.get_forbidden_combinations()
-        )
-        if is_forbidden_combination:
+        if (self.source_type, self.destination_type) in _FORBIDDEN_COMBINATIONS:
             raise ValueError(
-                f"Copy from {source_type.name} to "
-                f"{destination_type.name} is unsupported. "
+                f"Copy from {self.source_type.name} to "
+                f"{self.destination_type.name} is unsupported. "
                 "Please, reach us at https://github.com/neuro-inc/neuro-extras/issues "
                 "describing your use case."
             )
         else:
             logger.debug(
-                f"Copy from {source_type.name} to "
-                f"{destination_type.name} is supported"
+                f"Copy from {self.source_type.name} to "
+                f"{self.destination_type.name} is supported"
             )
 
     async def run(self) -> None:
@@ -86,24 +111,27 @@ class CopyOperation:
 
         Uses appropriate copier instance, that supports source and destionation
         """
-
-        with provide_temp_dir() as temp_dir:
-            logger.debug("Resolving copier...")
-            copier = _get_copier(
-                source=self.source,
-                destination=self.destination,
-                compress=self.compress,
-                extract=self.extract,
-                temp_dir=Path(temp_dir),
-                client=self.client,
-                volumes=self.volumes,
-                env=self.env,
-                life_span=self.life_span,
-                preset=self.preset,
+        if self._is_noop():
+            logger.info(
+                f"Skipping copy: source and destination are the same ({self.source})"
             )
+            return
+        async with provide_temp_dir() as temp_dir:
+            copier = self._copier_factory(temp_dir=Path(temp_dir))
             logger.debug(f"Using {copier.__class__.__name__}")
             await copier.perform_copy()
 
+    def _is_noop(self) -> bool:
+        """Check if the operation would copy data onto itself"""
+        if self.compress or self.extract:
+            return False
+        if self.source_type == self.destination_type == DataUrlType.LOCAL_FS:
+            # e.g. 'file' and './file' point to the same file
+            return (
+                self.source.as_path().resolve() == self.destination.as_path().resolve()
+            )
+        return self.source.url == self.destination.url
+
     @staticmethod
     def get_forbidden_combinations() -> List[Tuple[DataUrlType, DataUrlType]]:
         """Get forbidden combinations of source and destination types"""
@@ -119,67 +147,133 @@ class CopyOperation:
         ]
 
 
-def _get_copier(
+def _expand_combinations(
+    combinations: Iterable[Tuple[DataUrlType, DataUrlType]]
+) -> FrozenSet[Tuple[DataUrlType, DataUrlType]]:
+    """Expand pairs of url type categories (e.g. CLOUD)
+    into all matching pairs of concrete url types (e.g. S3, GCS)"""
+    url_types = DataUrlType.get_scheme_mapping().values()
+    return frozenset(
+        (source, destination)
+        for source_category, destination_category in combinations
+        for source in url_types
+        if source == source_category
+        for destination in url_types
+        if destination == destination_category
+    )
+
+
+# categories compare by bit overlap, so only concrete types are usable in set lookups
+_FORBIDDEN_COMBINATIONS = _expand_combinations(
+    CopyOperation.get_forbidden_combinations()
+)
+
+
+def _create_local_copier(
+    copier_class: Type[BaseLocalCopier],
     source: Resource,
     destination: Resource,
     compress: bool,
     extract: bool,
     temp_dir: Path,
+    **kwargs: Any,
+) -> Copier:
+    """Create copier, which runs on the local machine"""
+    return copier_class(
+        source=source,
+        destination=destination,
+        compress=compress,
+        extract=extract,
+        temp_dir=temp_dir,
+    )
+
+
+def _create_remote_copier(
+    source: Resource,
+    destination: Resource,
+    compress: bool,
+    extract: bool,
     client: Client,
     volumes: Optional[List[str]] = None,
     env: Optional[List[str]] = None,
     preset: Optional[str] = None,
     life_span: Optional[float] = None,
+    **kwargs: Any,
 ) -> Copier:
-    """Resolve an instance of Copier, which is able to copy
-    from source to destination with provided params"""
-    source_type = DataUrlType.get_type(source.url)
-    destination_type = DataUrlType.get_type(destination.url)
-    if source_type == DataUrlType.LOCAL_FS and destination_type == DataUrlType.CLOUD:
-        return LocalToCloudCopier(
-            source=source,
-            destination=destination,
-            compress=compress,
-            extract=extract,
-            temp_dir=temp_dir,
-        )
-    elif source_type == DataUrlType.CLOUD and destination_type == DataUrlType.LOCAL_FS:
-        return CloudToLocalCopier(
-            source=source,
-            destination=destination,
-            compress=compress,
-            extract=extract,
-            temp_dir=temp_dir,
-        )
-    elif (
-        source_type == DataUrlType.CLOUD
-        and destination_type == DataUrlType.PLATFORM
-        or source_type == DataUrlType.PLATFORM
-        and destination_type == DataUrlType.CLOUD
-        or source_type == DataUrlType.PLATFORM
-        and destination_type == DataUrlType.PLATFORM
-    ):
-        return RemoteCopier(
-            source=source,
-            destination=destination,
-            client=client,
-            compress=compress,
-            extract=extract,
-            volumes=volumes,
-            preset=preset,
-            env=env,
-            life_span=life_span,
-        )
-    elif source_type == DataUrlType.LOCAL_FS and destination_type.LOCAL_FS:
-        return LocalToLocalCopier(
-            source=source,
-            destination=destination,
-            compress=compress,
-            extract=extract,
-            temp_dir=temp_dir,
-        )
-    else:
+    """Create copier, which runs in the platform job"""
+    return RemoteCopier(
+        source=source,
+        destination=destination,
+        client=client,
+        compress=compress,
+        extract=extract,
+        volumes=volumes,
+        preset=preset,
+        env=env,
+        life_span=life_span,
+    )
+
+
+_CopierFactory = Callable[..., Copier]
+_COPIER_FACTORIES_BY_CATEGORY: List[
+    Tuple[Tuple[DataUrlType, DataUrlType], _CopierFactory]
+] = [
+    (
+        (DataUrlType.LOCAL_FS, DataUrlType.CLOUD),
+        partial(_create_local_copier, LocalToCloudCopier),
+    ),
+    (
+        (DataUrlType.CLOUD, DataUrlType.LOCAL_FS),
+        partial(_create_local_copier, CloudToLocalCopier),
+    ),
+    (
+        (DataUrlType.LOCAL_FS, DataUrlType.LOCAL_FS),
+        partial(_create_local_copier, LocalToLocalCopier),
+    ),
+    ((DataUrlType.CLOUD, DataUrlType.PLATFORM), _create_remote_copier),
+    ((DataUrlType.PLATFORM, DataUrlType.CLOUD), _create_remote_copier),
+    ((DataUrlType.PLATFORM, DataUrlType.PLATFORM), _create_remote_copier),
+]
+_COPIER_FACTORIES: Dict[Tuple[DataUrlType, DataUrlType], _CopierFactory] = {
+    combination: factory
+    for categories, factory in _COPIER_FACTORIES_BY_CATEGORY
+    for combination in _expand_combinations([categories])
+}
+
+
+def _bind_copier_factory(
+    source: Resource,
+    destination: Resource,
+    compress: bool,
+    extract: bool,
+    client: Client,
+    volumes: Optional[List[str]] = None,
+    env: Optional[List[str]] = None,
+    preset: Optional[str] = None,
+    life_span: Optional[float] = None,
+) -> Callable[..., Copier]:
+    """Resolve a factory of Copier, which is able to copy
+    from source to destination with provided params.
+
+    The returned factory only expects temp_dir keyword argument.
+    """
+    source_type = source.data_url_type
+    destination_type = destination.data_url_type
+    factory = _COPIER_FACTORIES.get((source_type, destination_type))
+    if factory is None:
         raise NotImplementedError(
             f"No copier found, that supports copy "
             f"from {source_type.name} to {destination_type.name}"
         )
+    return partial(
+        factory,
+        source=source,
+        destination=destination,
+        compress=compress,
+        extract=extract,
+        client=client,
+        volumes=volumes,
+        env=env,
+        preset=preset,
+        life_span=life_span,
+    )
@@ -1,22 +1,52 @@
 """Module for copying files by running neu.ro jobs"""
 
 import logging
+import shlex
+import weakref
 from dataclasses import dataclass, replace
-from typing import List, Mapping, Optional, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
-from apolo_cli.utils import resolve_disk
-from apolo_sdk import Client, DiskVolume, RemoteImage, SecretFile, Volume
+from apolo_sdk import (
+    Client,
+    DiskVolume,
+    EnvParseResult,
+    RemoteImage,
+    SecretFile,
+    Volume,
+    VolumeParseResult,
+)
 from yarl import URL
 
-from ..common import APOLO_EXTRAS_IMAGE, EX_OK, _attach_job_stdout
-from ..utils import get_default_preset, select_job_preset
+from ..common import (
+    APOLO_EXTRAS_IMAGE,
+    EX_OK,
+    _attach_job_stdout,
+    _resolve_disk_volumes,
+)
+from ..utils import select_job_preset
 from .common import Copier, DataUrlType, Resource
 
 
 logger = logging.getLogger(__name__)
 
+_DATA_CP_COMMAND_PREFIX = ("apolo-extras", "-v", "data", "cp")
 
-@dataclass
+# APOLO_EXTRAS_IMAGE, parsed by each of the clients
+_EXTRAS_IMAGE_CACHE: "weakref.WeakKeyDictionary[Client, RemoteImage]" = (
+    weakref.WeakKeyDictionary()
+)
+# volume and env specs, parsed by each of the clients
+_VOLUMES_CACHE: (
+    "weakref.WeakKeyDictionary[Client, Dict[Tuple[str, ...], VolumeParseResult]]"
+) = weakref.WeakKeyDictionary()
+_ENVS_CACHE: (
+    "weakref.WeakKeyDictionary[Client, Dict[Tuple[str, ...], EnvParseResult]]"
+) = weakref.WeakKeyDictionary()
+# number of parsed specs kept for each of the clients
+_PARSE_CACHE_SIZE = 256
+
+
+@dataclass(eq=False)
 class RemoteJobConfig:
     """Arguments, passed to `apolo_sdk.Client.jobs.start()`"""
 
@@ -46,7 +76,7 @@ class RemoteJobConfig:
         """Create `RemoteJobConfig` for a neu.ro copy job.
 
         Copy job will copy data from `source` to `destination`"""
-        image = apolo_client.parse.remote_image(APOLO_EXTRAS_IMAGE)
+        image = _get_extras_image(apolo_client)
 
         (patched_source, patched_destination, data_mounts) = _map_into_volumes(
             source=source,
@@ -61,20 +91,27 @@ class RemoteJobConfig:
             extract=extract,
             compress=compress,
         )
-        all_volumes = volumes + data_mounts if volumes else data_mounts
-        env_parse_result = apolo_client.parse.envs(env if env else [])
-        volume_parse_result = apolo_client.parse.volumes(all_volumes)
+        env_parse_result = _parse_envs(apolo_client, env if env else [])
+        # user volumes repeat between operations, while data mounts don't
+        user_volumes = _parse_volumes(apolo_client, volumes if volumes else [])
+        data_volumes = apolo_client.parse.volumes(data_mounts)
         preset_name = select_job_preset(
-            preset=preset, client=apolo_client, min_cpu=1, min_mem=2048
-        ) or get_default_preset(apolo_client)
+            preset=preset,
+            client=apolo_client,
+            min_cpu=1,
+            min_mem=2048,
+            fallback_to_default=True,
+        )
+        if preset_name is None:
+            raise ValueError("No resource presets are available in the cluster")
         return RemoteJobConfig(
             image=image,
             command=command,
             env=env_parse_result.env,
             secret_env=env_parse_result.secret_env,
-            volumes=list(volume_parse_result.volumes),
-            disk_volumes=list(volume_parse_result.disk_volumes),
-            secret_files=list(volume_parse_result.secret_files),
+            volumes=[*user_volumes.volumes, *data_volumes.volumes],
+            disk_volumes=[*user_volumes.disk_volumes, *data_volumes.disk_volumes],
+            secret_files=[*user_volumes.secret_files, *data_volumes.secret_files],
             preset_name=preset_name,
             life_span=life_span,
             pass_config=True,
@@ -124,12 +161,9 @@ class RemoteCopier(Copier):
 
     async def perform_copy(self) -> Resource:
         # apolo_client.jobs.start accepts disk URIs with IDs only
-        resolved_disks = []
-        for disk in self.job_config.disk_volumes:
-            disk_id = await resolve_disk(disk.disk_uri, client=self.apolo_client)
-            disk_with_id = replace(disk, disk_uri=disk.disk_uri / f"../{disk_id}")
-            resolved_disks.append(disk_with_id)
-
+        resolved_disks = await _resolve_disk_volumes(
+            self.job_config.disk_volumes, self.apolo_client
+        )
         self.job_config = replace(self.job_config, disk_volumes=resolved_disks)
 
         logger.info(f"Starting job from config: {self.job_config}")
@@ -155,6 +189,43 @@ class RemoteCopier(Copier):
         return self.destination
 
 
+def _get_extras_image(apolo_client: Client) -> RemoteImage:
+    """Get APOLO_EXTRAS_IMAGE, parsed once per client"""
+    image = _EXTRAS_IMAGE_CACHE.get(apolo_client)
+    if image is None:
+        image = apolo_client.parse.remote_image(APOLO_EXTRAS_IMAGE)
+        _EXTRAS_IMAGE_CACHE[apolo_client] = image
+    return image
+
+
+def _parse_volumes(apolo_client: Client, volumes: List[str]) -> VolumeParseResult:
+    """Parse volume specs, reusing results for the same specs and client"""
+    cache = _VOLUMES_CACHE.setdefault(apolo_client, {})
+    key = tuple(volumes)
+    result = cache.get(key)
+    if result is None:
+        _evict_oldest(cache)
+        result = cache[key] = apolo_client.parse.volumes(volumes)
+    return result
+
+
+def _parse_envs(apolo_client: Client, env: List[str]) -> EnvParseResult:
+    """Parse env specs, reusing results for the same specs and client"""
+    cache = _ENVS_CACHE.setdefault(apolo_client, {})
+    key = tuple(env)
+    result = cache.get(key)
+    if result is None:
+        _evict_oldest(cache)
+        result = cache[key] = apolo_client.parse.envs(env)
+    return result
+
+
+def _evict_oldest(cache: Dict[Tuple[str, ...], Any]) -> None:
+    """Drop the earliest added entry, if the cache is full"""
+    if len(cache) >= _PARSE_CACHE_SIZE:
+        del cache[next(iter(cache))]
+
+
 def _map_into_volumes(
     source: Resource,
     destination: Resource,
@@ -210,30 +281,33 @@ def _map_resource_into_volume(
     """
     volumes = []
     resource = resource.strip_mount_mode_flag()
-    if resource.data_url_type == DataUrlType.STORAGE:
-        if resource.filename:
+    data_url_type = resource.data_url_type
+    if data_url_type == DataUrlType.STORAGE:
+        storage_mountpoint = storage_mount_prefix + "/"
+        filename = resource.filename
+        if filename:
+            new_url = storage_mountpoint + filename
             if mount_files:
                 resource_url = resource.as_str()
-                mountpoint = f"{storage_mount_prefix}/{resource.filename}"
+                mountpoint = new_url
             else:
                 resource_url = resource.strip_filename().as_str()
-                mountpoint = f"{storage_mount_prefix}/"
-            new_url = f"{storage_mount_prefix}/{resource.filename}"
+                mountpoint = storage_mountpoint
         else:
             resource_url = resource.as_str()
-            mountpoint = f"{storage_mount_prefix}/"
+            mountpoint = storage_mountpoint
             new_url = mountpoint
-        volumes.append(f"{resource_url}:{mountpoint}:{mount_mode}")
-    elif resource.data_url_type == DataUrlType.DISK:
+        volumes.append(":".join((resource_url, mountpoint, mount_mode)))
+    elif data_url_type == DataUrlType.DISK:
         disk_full_id, path_on_disk = resource.disk_id_and_path
-        mount_mode = resource.mode_flag if resource.mode_flag else mount_mode
+        mount_mode = resource.mode_flag or mount_mode
         logger.debug(
             f"Parsed disk url {resource.url} into disk_id: {disk_full_id} "
             f"path_on_disk: {path_on_disk}, mode: {mount_mode}"
         )
-        mountpoint = f"{disk_mount_prefix}/"
-        new_url = f"{disk_mount_prefix}{path_on_disk}" if path_on_disk else mountpoint
-        volumes.append(f"{disk_full_id}:{mountpoint}:{mount_mode}")
+        mountpoint = disk_mount_prefix + "/"
+        new_url = disk_mount_prefix + path_on_disk if path_on_disk else mountpoint
+        volumes.append(":".join((disk_full_id, mountpoint, mount_mode)))
     else:
         new_url = resource.as_str()
     return new_url, volumes
@@ -243,12 +317,11 @@ def _build_data_copy_command(
     source: str, destination: str, extract: bool, compress: bool
 ) -> str:
     """Build a apolo-extras data cp command"""
-    command_prefix = ["apolo-extras", "-v", "data", "cp"]
-    args = [source, destination]
-    flags = []
+    full_command = [*_DATA_CP_COMMAND_PREFIX]
     if compress:
-        flags.append("-c")
+        full_command.append("-c")
     if extract:
-        flags.append("-x")
-    full_command = command_prefix + flags + args
-    return " ".join(full_command)
+        full_command.append("-x")
+    full_command += (source, destination)
+    # the job command is split with shlex, so urls with spaces stay intact
+    return shlex.join(full_command)
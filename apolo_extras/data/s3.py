@@ -1,11 +1,83 @@
 """Module for copying files from/to S3"""
 
+import atexit
+import configparser
+import logging
+import os
+import shutil
+import sys
+from functools import lru_cache
+from pathlib import Path
+from tempfile import mkdtemp
+from typing import Dict, List, Mapping, Optional, Tuple
+
 from ..utils import CLIRunner
 from .common import Copier, DataUrlType, Resource
 
 
+logger = logging.getLogger(__name__)
+
+# "aws" or "s5cmd", the latter is used only if it is installed
+S3_BACKEND = os.environ.get("APOLO_EXTRAS_S3_BACKEND", "aws")
+# route aws cli transfers through the nearest edge location,
+# the bucket should have transfer acceleration enabled
+S3_ACCELERATE = os.environ.get("APOLO_EXTRAS_S3_ACCELERATE", "").lower() in (
+    "1",
+    "true",
+)
+# recursive copies only transfer files, which are missing in the destination
+# or differ in size or modification time, instead of copying all of them
+S3_SYNC = os.environ.get("APOLO_EXTRAS_S3_SYNC", "").lower() in ("1", "true")
+
+# aws cli defaults to 8MB parts, which is too small for large objects,
+# see https://docs.aws.amazon.com/cli/latest/topic/s3-config.html
+S3_TRANSFER_CONFIG = {
+    "multipart_chunksize": "64MB",
+    "multipart_threshold": "64MB",
+    "max_concurrent_requests": "10",
+    "max_queue_size": "1000",
+}
+if S3_ACCELERATE:
+    S3_TRANSFER_CONFIG["use_accelerate_endpoint"] = "true"
+# recursive copies transfer files in parallel, which mostly helps small files,
+# since their transfer time is dominated by request latency
+S3_RECURSIVE_TRANSFER_CONFIG = {**S3_TRANSFER_CONFIG, "max_concurrent_requests": "32"}
+
+# aws cli config files, written by this process for each of the transfer configs
+_AWS_CONFIG_FILES: Dict[Tuple[Tuple[str, str], ...], Path] = {}
+
+
 class S3Copier(Copier, CLIRunner):
-    """Copier, that is capable of copying to/from Amazon S3"""
+    """Copier, that is capable of copying to/from Amazon S3
+
+    Copies with aws cli by default, through S3 Transfer Acceleration endpoint
+    if APOLO_EXTRAS_S3_ACCELERATE is set to 1.
+    Directories are synced instead of copied if APOLO_EXTRAS_S3_SYNC is set to 1.
+    If APOLO_EXTRAS_S3_BACKEND is set to s5cmd and s5cmd is installed,
+    copies with s5cmd, which transfers parts of the objects in parallel.
+    """
+
+    uses_expected_size = True
+
+    def __init__(self, source: Resource, destination: Resource) -> None:
+        super().__init__(source, destination)
+        # copy arguments don't change between calls of perform_copy
+        self._recursive = source.as_str().endswith("/")
+        self._transfer_config = (
+            S3_RECURSIVE_TRANSFER_CONFIG if self._recursive else S3_TRANSFER_CONFIG
+        )
+        self._sync = self._recursive and S3_SYNC
+        if self._sync:
+            self._args = ["s3", "sync"]
+        elif self._recursive:
+            self._args = ["s3", "cp", "--recursive"]
+        else:
+            self._args = ["s3", "cp"]
+        if not sys.stdout.isatty():
+            # progress updates and per-file lines are only useful on a terminal,
+            # e.g. copy jobs stream their whole output to the user
+            self._args += ("--no-progress", "--only-show-errors")
+        self._args += (source.as_str(), destination.as_str())
 
     def _ensure_can_execute(self) -> None:
         if not (
@@ -22,17 +94,105 @@ class S3Copier(Copier, CLIRunner):
 
     async def perform_copy(self) -> Resource:
         """Perform copy through running aws cli and return the url to destinaton"""
+        if S3_BACKEND == "s5cmd" and _s5cmd_available():
+            return await self._perform_copy_with_s5cmd()
 
-        command = "aws"
-        if self.source.as_str().endswith("/"):
-            args = [
-                "s3",
-                "cp",
-                "--recursive",
-                self.source.as_str(),
-                self.destination.as_str(),
-            ]
-        else:
-            args = ["s3", "cp", self.source.as_str(), self.destination.as_str()]
-        await self.run_command(command=command, args=args)
+        await self.run_command(command="aws", args=self._args, env=self._get_env())
         return self.destination
+
+    def _get_env(self) -> Dict[str, str]:
+        """Get environment of aws cli with the tuned s3 transfer config"""
+        config_file = _get_aws_config_file(self._transfer_config)
+        return {**os.environ, "AWS_CONFIG_FILE": str(config_file)}
+
+    async def _perform_copy_with_s5cmd(self) -> Resource:
+        """Perform copy through running s5cmd and return the url to destinaton"""
+        source = self.source.as_str()
+        if self._recursive:
+            # s5cmd copies directories by wildcards
+            source += "*"
+        args = [
+            "sync" if self._sync else "cp",
+            "--concurrency",
+            "16",
+            "--part-size",
+            "64",
+        ]
+        await self.run_command(
+            command="s5cmd", args=args + [source, self.destination.as_str()]
+        )
+        return self.destination
+
+    def get_download_stream_command(self) -> Optional[Tuple[str, List[str]]]:
+        """Stream S3 object into stdout through aws cli"""
+        if self.source.data_url_type != DataUrlType.S3 or self.source.filename is None:
+            return None
+        return "aws", ["s3", "cp", self.source.as_str(), "-"]
+
+    def get_upload_stream_command(
+        self, expected_size: Optional[int] = None
+    ) -> Optional[Tuple[str, List[str]]]:
+        """Stream stdin into S3 object through aws cli"""
+        if (
+            self.destination.data_url_type != DataUrlType.S3
+            or self.destination.filename is None
+        ):
+            return None
+        args = ["s3", "cp", "-", self.destination.as_str()]
+        if expected_size is not None:
+            # otherwise the part size can't grow for objects above
+            # 10000 parts of multipart_chunksize
+            args += ["--expected-size", str(expected_size)]
+        return "aws", args
+
+    def get_stream_env(self) -> Optional[Mapping[str, str]]:
+        """Stream commands use the same tuned transfer config as copies"""
+        return self._get_env()
+
+
+@lru_cache(maxsize=None)
+def _s5cmd_available() -> bool:
+    """Check if s5cmd, parallel S3 client, is installed"""
+    available = shutil.which("s5cmd") is not None
+    if not available:
+        logger.warning("s5cmd is not installed, falling back to aws cli")
+    return available
+
+
+def _get_aws_config_file(transfer_config: Mapping[str, str]) -> Path:
+    """Get a copy of the aws cli config with s3 transfer settings
+    added to the active profile.
+
+    The copy is written once per process and removed at exit.
+    The settings, which are already present in the user config, are kept.
+    """
+    key = tuple(sorted(transfer_config.items()))
+    config_file = _AWS_CONFIG_FILES.get(key)
+    if config_file is None:
+        config_dir = mkdtemp(prefix="apolo-extras-aws-")
+        atexit.register(shutil.rmtree, config_dir, ignore_errors=True)
+        config_file = Path(config_dir) / "config"
+        _write_aws_config(config_file, transfer_config)
+        _AWS_CONFIG_FILES[key] = config_file
+    return config_file
+
+
+def _write_aws_config(config_file: Path, transfer_config: Mapping[str, str]) -> None:
+    """Write the user aws cli config with s3 transfer settings into config_file"""
+    parser = configparser.ConfigParser(interpolation=None, strict=False)
+    parser.optionxform = str  # type: ignore
+    parser.read(os.path.expanduser(os.environ.get("AWS_CONFIG_FILE", "~/.aws/config")))
+    profile = os.environ.get("AWS_PROFILE", "default")
+    section = profile if profile == "default" else f"profile {profile}"
+    if not parser.has_section(section):
+        parser.add_section(section)
+    s3_config = dict(transfer_config)
+    for line in parser.get(section, "s3", fallback="").splitlines():
+        key, _, value = line.partition("=")
+        if key.strip():
+            s3_config[key.strip()] = value.strip()
+    parser.set(
+        section, "s3", "".join(f"\n{key} = {value}" for key, value in s3_config.items())
+    )
+    with config_file.open("w") as f:
+        parser.write(f)
@@ -1,10 +1,28 @@
 """Module for copying files from HTTP(S) sources"""
 
-from ..utils import CLIRunner
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import BinaryIO
+
+import aiohttp
+from yarl import URL
+
 from .common import Copier, DataUrlType, Resource
+from .fs import _preallocate
+
 
+logger = logging.getLogger(__name__)
 
-class WebCopier(Copier, CLIRunner):
+WEB_CHUNK_SIZE = 1024 * 1024
+# files above this size are downloaded by several ranges in parallel,
+# if the server supports range requests
+WEB_RANGES_THRESHOLD = 64 * 1024 * 1024
+WEB_RANGES_COUNT = 8
+
+
+class WebCopier(Copier):
     """Copier for downloading data from HTTP(S) sources"""
 
     def _ensure_can_execute(self) -> None:
@@ -16,27 +34,115 @@ class WebCopier(Copier, CLIRunner):
                 f"Can only copy from {DataUrlType.WEB.name} "
                 f"to {DataUrlType.LOCAL_FS.name}"
             )
-
-    async def perform_copy(self) -> Resource:
-        """Perform copy through running rclone and return the url to destinaton"""
-        if not self.source.data_url_type == DataUrlType.WEB:
-            raise ValueError("Only copy from HTTP(s) sources is supported")
-        if self.destination.data_url_type == DataUrlType.WEB:
-            raise ValueError("Copy to HTTP(S) destinations is unsupported")
         if self.source.filename is None:
             raise ValueError(
                 "Copy from HTTP(S) directory is unsupported. "
                 "Please, reach us at https://github.com/neuro-inc/neuro-extras/issues "
                 "describing your use case."
             )
-        command = "rclone"
-        args = [
-            "copyto",
-            "--http-url",
-            # HTTP URL parameter for rclone is just scheme + host name
-            str(self.source.url.with_path("").with_query("")),
-            f":http:{self.source.url.path}",
-            self.destination.as_str(),
-        ]
-        await self.run_command(command=command, args=args)
+
+    async def perform_copy(self) -> Resource:
+        """Download the source with aiohttp and return the url to destinaton"""
+        destination = self.destination.as_path()
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        logger.info(f"Downloading {self.source} into {destination}")
+        # a failed download must not leave a complete-looking destination,
+        # so the file is only renamed into it once all of the data is written
+        partial = destination.with_name(f".{destination.name}.{os.getpid()}.part")
+        try:
+            await self._download(partial)
+            os.replace(partial, destination)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
         return self.destination
+
+    async def _download(self, destination: Path) -> None:
+        """Download the source into the destination file"""
+        connector = aiohttp.TCPConnector(limit=WEB_RANGES_COUNT)
+        # large files may take long to download, so only reads are timed out
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=60, sock_read=60)
+        # the body is saved as-is, the same way the server stores it,
+        # proxies are taken from the environment, as curl and wget do
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            auto_decompress=False,
+            trust_env=True,
+        ) as session:
+            async with session.get(self.source.url) as response:
+                response.raise_for_status()
+                size = response.content_length
+                if (
+                    size is not None
+                    and size > WEB_RANGES_THRESHOLD
+                    and response.headers.get("Accept-Ranges") == "bytes"
+                ):
+                    response.close()
+                    await _download_ranges(session, self.source.url, destination, size)
+                else:
+                    with destination.open("wb") as file:
+                        if size is not None:
+                            _preallocate(file.fileno(), size)
+                        await _write_response(response, file)
+
+
+async def _write_response(response: aiohttp.ClientResponse, file: BinaryIO) -> None:
+    """Write the response body into the file chunk by chunk"""
+    async for chunk in response.content.iter_chunked(WEB_CHUNK_SIZE):
+        await asyncio.to_thread(file.write, chunk)
+
+
+async def _download_ranges(
+    session: aiohttp.ClientSession, url: URL, destination: Path, size: int
+) -> None:
+    """Download the file of the given size by WEB_RANGES_COUNT parallel
+    range requests, each written at its offset in the destination"""
+    range_size = -(-size // WEB_RANGES_COUNT)
+    with destination.open("wb") as file:
+        file.truncate(size)
+        _preallocate(file.fileno(), size)
+        tasks = [
+            asyncio.ensure_future(
+                _download_range(
+                    session, url, file.fileno(), start, min(start + range_size, size)
+                )
+            )
+            for start in range(0, size, range_size)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # no range may write into the file descriptor after it is closed
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _download_range(
+    session: aiohttp.ClientSession, url: URL, fd: int, start: int, end: int
+) -> None:
+    """Download bytes [start, end) of the url into the file descriptor"""
+    headers = {"Range": f"bytes={start}-{end - 1}"}
+    async with session.get(url, headers=headers) as response:
+        response.raise_for_status()
+        if response.status != 206:
+            raise RuntimeError(f"Range request to {url} is not supported")
+        offset = start
+        async for chunk in response.content.iter_chunked(WEB_CHUNK_SIZE):
+            await asyncio.to_thread(_pwrite_all, fd, chunk, offset)
+            offset += len(chunk)
+    if offset != end:
+        raise RuntimeError(
+            f"Incomplete download of {url}: got {offset - start} bytes "
+            f"of range {start}-{end - 1}"
+        )
+
+
+def _pwrite_all(fd: int, data: bytes, offset: int) -> None:
+    """Write the whole data at the offset, os.pwrite may write only a part of it"""
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
@@ -3,9 +3,10 @@ import logging
 import sys
 import tempfile
 import textwrap
+from contextlib import asynccontextmanager
 from dataclasses import replace
 from pathlib import Path
-from typing import Optional, Sequence, Tuple
+from typing import AsyncIterator, Optional, Sequence, Tuple
 
 import apolo_sdk
 import click
@@ -270,11 +271,6 @@ def image_build_local(
         sys.exit(EX_PLATFORMERROR)
 
 
-async def _parse_platform_image(image: str) -> apolo_sdk.RemoteImage:
-    async with get_platform_client() as client:
-        return client.parse.remote_image(image)
-
-
 def _get_cluster_from_uri(
     client: apolo_sdk.Client,
     image_uri: str,
@@ -293,9 +289,30 @@ def _get_cluster_from_uri(
         return None
 
 
+@asynccontextmanager
+async def _get_image_cluster_client(
+    image_uri_str: str, project_name: Optional[str] = None
+) -> AsyncIterator[apolo_sdk.Client]:
+    """Get client for the cluster of the image
+
+    The client, which parsed the image uri, is reused
+    if the image is on the current cluster.
+    """
+    async with get_platform_client() as client:
+        cluster = _get_cluster_from_uri(
+            client, image_uri_str, project_name, scheme="image"
+        )
+        if cluster in (None, client.cluster_name):
+            yield client
+            return
+    async with get_platform_client(cluster=cluster) as client:
+        yield client
+
+
 async def _image_transfer(
     src_uri_str: str, dst_uri_str: str, force_overwrite: bool
 ) -> int:
+    src_image: Optional[apolo_sdk.RemoteImage] = None
     async with get_platform_client() as client:
         src_cluster: Optional[str] = _get_cluster_from_uri(
             client, src_uri_str, scheme="image"
@@ -307,11 +324,16 @@ async def _image_transfer(
             raise ValueError(
                 f"Invalid destination image {dst_uri_str}: missing cluster name"
             )
+        if src_cluster in (None, client.cluster_name):
+            # no need to switch the cluster for the source image
+            src_image = client.parse.remote_image(image=src_uri_str)
+            src_reg_auth = await create_docker_config_auth(client.config)
 
     with tempfile.TemporaryDirectory() as tmpdir:
-        async with get_platform_client(cluster=src_cluster) as src_client:
-            src_image = src_client.parse.remote_image(image=src_uri_str)
-            src_reg_auth = await create_docker_config_auth(src_client.config)
+        if src_image is None:
+            async with get_platform_client(cluster=src_cluster) as src_client:
+                src_image = src_client.parse.remote_image(image=src_uri_str)
+                src_reg_auth = await create_docker_config_auth(src_client.config)
 
         dockerfile = Path(f"{tmpdir}/Dockerfile")
         dockerfile.write_text(
@@ -357,13 +379,9 @@ async def _build_image(
     project_name: Optional[str] = None,
     extra_kaniko_args: Optional[str] = None,
 ) -> int:
-    async with get_platform_client() as client:
-        cluster = _get_cluster_from_uri(
-            client, image_uri_str, project_name, scheme="image"
-        )
-    async with get_platform_client(cluster=cluster) as client:
+    async with _get_image_cluster_client(image_uri_str, project_name) as client:
         image_uri = client.parse.str_to_uri(image_uri_str, project_name=project_name)
-        image = await _parse_platform_image(str(image_uri))
+        image = client.parse.remote_image(str(image_uri))
         context_uri = client.parse.str_to_uri(
             context,
             project_name=project_name,
@@ -1,22 +1,43 @@
 import asyncio
 import base64
+import hashlib
+import itertools
 import json
 import logging
-import re
+import secrets
 import shlex
-import uuid
+import tarfile
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
+from datetime import timedelta
+from functools import cached_property
 from pathlib import Path
-from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Type
-
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    cast,
+)
+
+import aiohttp
 import apolo_sdk
 import click
-from apolo_cli.formatters.images import DockerImageProgress
 from apolo_sdk._url_utils import _extract_path
-from rich.console import Console
 from yarl import URL
 
+from .common import _attach_job_stdout, _resolve_disk_volumes
+from .utils import get_default_preset
+
 
 KANIKO_IMAGE_REF = "gcr.io/kaniko-project/executor"
 KANIKO_IMAGE_TAG = "v1.20.0-debug"  # debug has busybox, which is needed for auth
@@ -24,9 +45,22 @@ KANIKO_AUTH_PREFIX = "NE_REGISTRY_AUTH"
 KANIKO_DOCKER_CONFIG_PATH = "/kaniko/.docker/config.json"
 KANIKO_AUTH_SCRIPT_PATH = "/kaniko/.docker/merge_docker_auths.sh"
 KANIKO_CONTEXT_PATH = "/kaniko_context"
+KANIKO_CONTEXT_ARCHIVE_PATH = "/kaniko_context.tar.gz"
+CONTEXT_ARCHIVE_CHUNK_SIZE = 1024 * 1024
+# the archive is uploaded again from scratch on network errors,
+# with exponential backoff in seconds between the attempts
+CONTEXT_UPLOAD_ATTEMPTS = 3
+CONTEXT_UPLOAD_BACKOFF = 1.0
 KANIKO_EXTRA_ENVS = ("container=docker",)
-BUILDER_JOB_LIFESPAN = "4h"
-BUILDER_JOB_SHEDULE_TIMEOUT = "20m"
+BUILDER_JOB_LIFESPAN = timedelta(hours=4).total_seconds()
+BUILDER_JOB_SHEDULE_TIMEOUT = timedelta(minutes=20).total_seconds()
+
+_HTTP_PREFIXES = ("https://", "http://")
+_MERGE_AUTHS_SCRIPT_URL = URL(
+    (Path(__file__).parent / "assets" / "merge_docker_auths.sh").as_uri()
+)
+# async predicate over relative paths, as FileFilter.match
+_FilterFunc = Callable[[str], Awaitable[bool]]
 
 MIN_BUILD_PRESET_CPU: float = 2
 MIN_BUILD_PRESET_MEM: int = 4096
@@ -34,26 +68,42 @@ MIN_BUILD_PRESET_MEM: int = 4096
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True)
 class DockerConfigAuth:
     registry: str
     username: str
     password: str = field(repr=False)
+    # base64-encoded "username:password", computed once on creation
+    credentials: str = field(init=False, repr=False, compare=False)
 
-    @property
-    def credentials(self) -> str:
-        return base64.b64encode(f"{self.username}:{self.password}".encode()).decode()
+    def __post_init__(self) -> None:
+        credentials = b"%s:%s" % (self.username.encode(), self.password.encode())
+        object.__setattr__(
+            self, "credentials", base64.b64encode(credentials).decode("ascii")
+        )
 
 
-@dataclass
+@dataclass(frozen=True)
 class DockerConfig:
     auths: Sequence[DockerConfigAuth] = ()
 
-    def to_primitive(self) -> Dict[str, Any]:
+    @cached_property
+    def _primitive(self) -> Dict[str, Any]:
         return {
             "auths": {auth.registry: {"auth": auth.credentials} for auth in self.auths}
         }
 
+    @cached_property
+    def _json_bytes(self) -> bytes:
+        return json.dumps(self._primitive).encode()
+
+    def to_primitive(self) -> Dict[str, Any]:
+        return self._primitive
+
+    def to_json_bytes(self) -> bytes:
+        """Docker config.json contents, encoded once per config"""
+        return self._json_bytes
+
 
 async def create_docker_config_auth(
     client_config: apolo_sdk.Config,
@@ -71,6 +121,53 @@ async def create_docker_config_auth(
     return auth
 
 
+def _split_inline_auths(envs: Sequence[str]) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """Split envs into the job envs and extra docker configs given inline
+
+    Extra auth envs, referring to secrets or files, are kept in the job envs.
+    """
+    job_envs = []
+    inline_auths = []
+    for env in envs:
+        name, sep, value = env.partition("=")
+        if KANIKO_AUTH_PREFIX in name and sep and not value.startswith("secret:"):
+            try:
+                config = json.loads(value)
+            except ValueError:
+                config = None
+            if isinstance(config, dict):
+                inline_auths.append(config)
+                continue
+        job_envs.append(env)
+    return job_envs, inline_auths
+
+
+def _dump_docker_config(
+    docker_config: DockerConfig, extra_configs: Sequence[Mapping[str, Any]] = ()
+) -> bytes:
+    """Encode docker config with the extra configs merged into it"""
+    if not extra_configs:
+        return docker_config.to_json_bytes()
+    primitive = docker_config.to_primitive()
+    for extra_config in extra_configs:
+        primitive = _merge_docker_configs(primitive, extra_config)
+    return json.dumps(primitive).encode()
+
+
+def _merge_docker_configs(
+    base: Mapping[str, Any], extra: Mapping[str, Any]
+) -> Dict[str, Any]:
+    """Recursively merge extra docker config into the base one,
+    the same way merge_docker_auths.sh does"""
+    result = dict(base)
+    for key, value in extra.items():
+        if isinstance(value, Mapping) and isinstance(result.get(key), Mapping):
+            result[key] = _merge_docker_configs(result[key], value)
+        else:
+            result[key] = value
+    return result
+
+
 class ImageBuilder(ABC):
     def __init__(
         self,
@@ -96,25 +193,78 @@ class ImageBuilder(ABC):
         self._client = client
         self._extra_registry_auths = list(extra_registry_auths)
         self._verbose = verbose
+        # parsed image references by image uri
+        self._image_refs: Dict[str, str] = {}
+        # kaniko layer cache repositories by project name
+        self._cache_repos: Dict[str, str] = {}
 
     def _generate_build_uri(self, project_name: str) -> URL:
         return self._client.parse.normalize_uri(
-            URL(f"storage:/{project_name}/.builds/{uuid.uuid4()}"),
+            URL(f"storage:/{project_name}/.builds/{secrets.token_hex(16)}"),
+        )
+
+    def _generate_docker_config_uri(self, project_name: str, payload: bytes) -> URL:
+        digest = hashlib.blake2b(payload, digest_size=16).hexdigest()
+        return self._client.parse.normalize_uri(
+            URL(f"storage:/{project_name}/.builds/auths/{digest}.json"),
         )
 
     async def create_docker_config(self) -> DockerConfig:
         dst_reg_auth = await create_docker_config_auth(self._client.config)
-        return DockerConfig(auths=[dst_reg_auth] + self._extra_registry_auths)
+        return DockerConfig(auths=(dst_reg_auth, *self._extra_registry_auths))
 
-    async def save_docker_config(self, docker_config: DockerConfig, uri: URL) -> None:
-        async def _gen() -> AsyncIterator[bytes]:
-            yield json.dumps(docker_config.to_primitive()).encode()
+    async def save_docker_config(
+        self,
+        docker_config: DockerConfig,
+        uri: URL,
+        extra_configs: Sequence[Mapping[str, Any]] = (),
+    ) -> None:
+        await self._save_payload(_dump_docker_config(docker_config, extra_configs), uri)
 
-        await self._client.storage.create(uri, _gen())
+    async def _save_payload(self, payload: bytes, uri: URL) -> None:
+        await self._client.storage.create(uri, _iter_payload(payload))
+
+    async def _save_payload_once(self, payload: bytes, uri: URL) -> None:
+        """Upload the payload unless it is already there,
+        the uri is expected to be derived from the payload contents"""
+        try:
+            await self._client.storage.stat(uri)
+            logger.debug(f"Reusing {uri}")
+            return
+        except apolo_sdk.ResourceNotFound:
+            pass
+        logger.debug(f"Uploading {uri}")
+        await self._client.storage.mkdir(uri.parent, parents=True, exist_ok=True)
+        await self._save_payload(payload, uri)
 
     def parse_image_ref(self, image_uri_str: str) -> str:
-        image = self._client.parse.remote_image(image_uri_str)
-        return re.sub(r"^http[s]?://", "", image.as_docker_url())
+        image_ref = self._image_refs.get(image_uri_str)
+        if image_ref is None:
+            image = self._client.parse.remote_image(image_uri_str)
+            image_ref = image.as_docker_url()
+            for prefix in _HTTP_PREFIXES:
+                if image_ref.startswith(prefix):
+                    image_ref = image_ref[len(prefix) :]
+                    break
+            self._image_refs[image_uri_str] = image_ref
+        return image_ref
+
+    def _get_cache_repo(self, project_name: str) -> str:
+        cache_repo = self._cache_repos.get(project_name)
+        if cache_repo is None:
+            cache_image = apolo_sdk.RemoteImage(
+                name="layer-cache/cache",
+                project_name=project_name,
+                registry=str(self._client.config.registry_url),
+                cluster_name=self._client.cluster_name,
+                org_name=self._client.config.org_name,
+            )
+            cache_repo = self.parse_image_ref(str(cache_image))
+            repo, _, tag = cache_repo.rpartition(":")
+            if repo and "/" not in tag:  # drop tag, but not the registry port
+                cache_repo = repo
+            self._cache_repos[project_name] = cache_repo
+        return cache_repo
 
     @abstractmethod
     async def build(
@@ -169,11 +319,7 @@ class LocalImageBuilder(ImageBuilder):
                 "They will be ignored."
             )
 
-        docker_build_args = []
-
-        for arg in build_args:
-            docker_build_args.append(f"--build-arg {arg}")
-
+        docker_build_args = [f"--build-arg {arg}" for arg in build_args]
         build_command = [
             "docker",
             "build",
@@ -192,6 +338,9 @@ class LocalImageBuilder(ImageBuilder):
         return await self._push_image(image)
 
     async def _push_image(self, image: apolo_sdk.RemoteImage) -> int:
+        from apolo_cli.formatters.images import DockerImageProgress
+        from rich.console import Console
+
         logger.info(f"Pushing image to registry")
         console = Console()
         progress = DockerImageProgress.create(console=console, quiet=not self._verbose)
@@ -230,65 +379,88 @@ class RemoteImageBuilder(ImageBuilder):
         logger.info(f"Building the image {image}")
         logger.info(f"Using {context_uri} as the build context")
 
-        # upload (if needed) build context and platform registry auth info
+        # upload (if needed) build context and platform registry auth info,
+        # independent uploads run concurrently once the build dir exists
         build_uri = self._generate_build_uri(project_name)
-        await self._client.storage.mkdir(build_uri, parents=True)
+        docker_config, _ = await asyncio.gather(
+            self.create_docker_config(),
+            self._client.storage.mkdir(build_uri, parents=True),
+        )
+        # extra auth configs given inline are merged into the uploaded config,
+        # the ones from secrets or files are only available within the job
+        job_envs, inline_auths = _split_inline_auths(envs)
+        # builds of the project with the same auth info share the uploaded config
+        docker_config_payload = _dump_docker_config(docker_config, inline_auths)
+        docker_config_uri = self._generate_docker_config_uri(
+            project_name, docker_config_payload
+        )
+        uploads = [self._save_payload_once(docker_config_payload, docker_config_uri)]
+        context_archive_uri: Optional[URL] = None
         if context_uri.scheme == "file":
-            storage_context_uri = build_uri / "context"
-            await self._upload_to_storage(context_uri, storage_context_uri)
-            context_uri = storage_context_uri
-
-        docker_config = await self.create_docker_config()
-        docker_config_uri = build_uri / ".docker.config.json"
-        logger.debug(f"Uploading {docker_config_uri}")
-        await self.save_docker_config(docker_config, docker_config_uri)
+            if any(f":{KANIKO_CONTEXT_PATH}" in volume for volume in volumes):
+                # volumes mounted into the context need it to be a directory
+                storage_context_uri = build_uri / "context"
+                uploads.append(
+                    self._upload_to_storage(context_uri, storage_context_uri)
+                )
+                context_uri = storage_context_uri
+            else:
+                # single archive upload instead of a request per file
+                context_archive_uri = build_uri / "context.tar.gz"
+                uploads.append(
+                    self._upload_archive_to_storage(context_uri, context_archive_uri)
+                )
+        job_volumes = list(volumes)
 
-        cache_image = apolo_sdk.RemoteImage(
-            name="layer-cache/cache",
-            project_name=project_name,
-            registry=str(self._client.config.registry_url),
-            cluster_name=self._client.cluster_name,
-            org_name=self._client.config.org_name,
-        )
-        cache_repo = self.parse_image_ref(str(cache_image))
-        cache_repo = re.sub(r":.*$", "", cache_repo)  # drop tag
+        cache_repo = self._get_cache_repo(project_name)
 
-        if any(KANIKO_AUTH_PREFIX in env for env in envs):
+        # envs are parsed once, envs added for the job go into the parsed result
+        env_parsed = self._client.parse.envs(job_envs)
+        job_env = dict(env_parsed.env)
+        env_names = list(itertools.chain(env_parsed.env, env_parsed.secret_env))
+        if any(KANIKO_AUTH_PREFIX in name for name in env_names):
             # we have extra auth info.
             # in this case we cannot mount registry auth info at the default path
             # and should upload and configure 'merge_docker_auths' script to merge auths
             mnt_path = Path(KANIKO_DOCKER_CONFIG_PATH)
             mnt_path = mnt_path.with_name(f"{mnt_path.stem}_base{mnt_path.suffix}")
             docker_config_mnt = str(mnt_path)
-            envs += (
-                f"{KANIKO_AUTH_PREFIX}_BASE_{uuid.uuid4().hex[:8]}={docker_config_mnt}",
-            )
-            local_script = URL(
-                (Path(__file__).parent / "assets" / "merge_docker_auths.sh").as_uri()
+            job_env[f"{KANIKO_AUTH_PREFIX}_BASE_{secrets.token_hex(4)}"] = (
+                docker_config_mnt
             )
             remote_script = build_uri / "merge_docker_auths.sh"
-            await self._client.storage.upload_file(local_script, remote_script)
-            volumes += (f"{remote_script}:{KANIKO_AUTH_SCRIPT_PATH}:ro",)
-            job_entrypoint_overwrite = [
-                f"sh {KANIKO_AUTH_SCRIPT_PATH}",
-                "&&",
-                "executor",
-                # Kaniko args will be added below
-            ]
+            uploads.append(
+                self._client.storage.upload_file(_MERGE_AUTHS_SCRIPT_URL, remote_script)
+            )
+            job_volumes.append(f"{remote_script}:{KANIKO_AUTH_SCRIPT_PATH}:ro")
+            # Kaniko args will be added below
+            job_script: Optional[str] = f"sh {KANIKO_AUTH_SCRIPT_PATH} && executor"
         else:
             docker_config_mnt = str(KANIKO_DOCKER_CONFIG_PATH)
-            job_entrypoint_overwrite = []
+            job_script = None
+        await asyncio.gather(*uploads)
 
         # mount build context and platform registry auth info
-        volumes += (
-            f"{docker_config_uri}:{docker_config_mnt}:ro",
+        job_volumes.append(f"{docker_config_uri}:{docker_config_mnt}:ro")
+        if context_archive_uri:
+            job_volumes.append(
+                f"{context_archive_uri}:{KANIKO_CONTEXT_ARCHIVE_PATH}:ro"
+            )
+            # kaniko unpacks the archive and looks for the dockerfile inside
+            context_args = [
+                f"--context=tar://{KANIKO_CONTEXT_ARCHIVE_PATH}",
+                f"--dockerfile={dockerfile_path.as_posix()}",
+            ]
+        else:
             # context dir cannot be R/O if we want to mount secrets there
-            f"{context_uri}:{KANIKO_CONTEXT_PATH}:rw",
-        )
-        build_tags += (f"kaniko-builds-image:{image}",)
+            job_volumes.append(f"{context_uri}:{KANIKO_CONTEXT_PATH}:rw")
+            context_args = [
+                f"--context={KANIKO_CONTEXT_PATH}",
+                f"--dockerfile={KANIKO_CONTEXT_PATH}/{dockerfile_path.as_posix()}",
+            ]
+        job_tags = [*build_tags, f"kaniko-builds-image:{image}"]
         kaniko_args = [
-            f"--context={KANIKO_CONTEXT_PATH}",
-            f"--dockerfile={KANIKO_CONTEXT_PATH}/{dockerfile_path.as_posix()}",
+            *context_args,
             f"--destination={image.as_docker_url(with_scheme=False)}",
             f"--cache={'true' if use_cache else 'false'}",
             f"--cache-repo={cache_repo}",
@@ -300,72 +472,136 @@ class RemoteImageBuilder(ImageBuilder):
         ]
 
         for arg in build_args:
-            kaniko_args.append(f"--build-arg {arg}")
+            kaniko_args.extend(("--build-arg", arg))
         # env vars (which might be platform secrets too) are passed as build args
-        env_parsed = self._client.parse.envs(envs)
-        for arg in list(env_parsed.env) + list(env_parsed.secret_env):
-            if KANIKO_AUTH_PREFIX not in arg:
-                kaniko_args.append(f"--build-arg {arg}")
+        for name in env_names:
+            if KANIKO_AUTH_PREFIX not in name:
+                kaniko_args.extend(("--build-arg", name))
 
         kaniko_args = self._add_extra_kaniko_args(kaniko_args, extra_kaniko_args)
 
-        build_command = [
-            "apolo",
-            "--disable-pypi-version-check",
-            "job",
-            "run",
-            f"--life-span={BUILDER_JOB_LIFESPAN}",
-            f"--schedule-timeout={BUILDER_JOB_SHEDULE_TIMEOUT}",
-            f"--project={project_name}",
-        ]
-        if job_preset:
-            build_command.append(f"--preset={job_preset}")
-        for build_tag in build_tags:
-            build_command.append(f"--tag={build_tag}")
-        for volume in volumes:
-            build_command.append(f"--volume={volume}")
-        for env in envs:
-            build_command.append(f"--env={env}")
-        envs_keys = [e.split("=")[0] for e in envs]
         for extra_env in KANIKO_EXTRA_ENVS:
-            if extra_env.split("=")[0] in envs_keys:
+            name, _, value = extra_env.partition("=")
+            if name in env_names:
                 logger.warning(
                     f"Cannot overwite env {extra_env}: already present. "
                     "Consider removing this environment variable from your config, "
                     "otherwise, the build might fail."
                 )
             else:
-                build_command.append(f"--env={extra_env}")
-
-        kaniko_args_str = " ".join(kaniko_args)
-        if job_entrypoint_overwrite:
-            job_entrypoint_overwrite.append(kaniko_args_str)
-            build_command.append("--entrypoint")
-            build_command.append(
-                f"sh -c {shlex.quote(' '.join(job_entrypoint_overwrite))}"
+                job_env[name] = value
+
+        # the job command is split by the shell rules, so values with spaces
+        # are passed to kaniko as is
+        kaniko_args_str = shlex.join(kaniko_args)
+        if job_script:
+            # the script is quoted as a whole, kaniko args are split by the shell
+            entrypoint: Optional[str] = shlex.join(
+                ["sh", "-c", f"{job_script} {kaniko_args_str}"]
             )
-            build_command.append(f"{KANIKO_IMAGE_REF}:{KANIKO_IMAGE_TAG}")
+            command: Optional[str] = None
         else:
-            build_command.append(f"{KANIKO_IMAGE_REF}:{KANIKO_IMAGE_TAG}")
-            build_command.append("--")
-            build_command.append(kaniko_args_str)
+            entrypoint = None
+            command = kaniko_args_str
 
         # TODO: remove context after the build is finished?
-        return await self._execute_subprocess(build_command)
+        return await self._run_builder_job(
+            entrypoint=entrypoint,
+            command=command,
+            volumes=job_volumes,
+            env=job_env,
+            secret_env=env_parsed.secret_env,
+            job_preset=job_preset,
+            build_tags=job_tags,
+            project_name=project_name,
+        )
+
+    async def _run_builder_job(
+        self,
+        entrypoint: Optional[str],
+        command: Optional[str],
+        volumes: Sequence[str],
+        env: Mapping[str, str],
+        secret_env: Mapping[str, URL],
+        job_preset: Optional[str],
+        build_tags: Sequence[str],
+        project_name: str,
+    ) -> int:
+        """Start Kaniko job with the platform client, stream its output
+        and return its exit code"""
+        volume_parse_result = self._client.parse.volumes(volumes)
+        # jobs accept disk URIs with IDs only
+        disk_volumes = await _resolve_disk_volumes(
+            volume_parse_result.disk_volumes, self._client
+        )
+        job = await self._client.jobs.start(
+            image=self._client.parse.remote_image(
+                f"{KANIKO_IMAGE_REF}:{KANIKO_IMAGE_TAG}"
+            ),
+            preset_name=job_preset or get_default_preset(self._client),
+            entrypoint=entrypoint,
+            command=command,
+            env=env,
+            secret_env=secret_env,
+            volumes=list(volume_parse_result.volumes),
+            secret_files=list(volume_parse_result.secret_files),
+            disk_volumes=disk_volumes,
+            tags=build_tags,
+            life_span=BUILDER_JOB_LIFESPAN,
+            schedule_timeout=BUILDER_JOB_SHEDULE_TIMEOUT,
+            project_name=project_name,
+        )
+        logger.info(f"Started builder job {job.id}")
+        return await _attach_job_stdout(job, self._client, name="builder")
+
+    async def _get_context_filter(self) -> Tuple[apolo_sdk.FileFilter, FrozenSet[str]]:
+        """Get filter and ignore file names, which skip the same files
+        as `apolo cp` does"""
+        from apolo_cli.storage import calc_filters, calc_ignore_file_names
+
+        ignore_file_names = await calc_ignore_file_names(self._client, None)
+        file_filter = apolo_sdk.FileFilter()
+        for exclude, pattern in await calc_filters(self._client, None):
+            file_filter.append(exclude, pattern)
+        return file_filter, frozenset(ignore_file_names)
 
     async def _upload_to_storage(self, local_url: URL, remote_url: URL) -> None:
         logger.info(f"Uploading {local_url} to {remote_url}")
-        command = [
-            "apolo",
-            "--disable-pypi-version-check",
-            "cp",
-            "--recursive",
-            str(local_url),
-            str(remote_url),
-        ]
-        return_code = await self._execute_subprocess(command)
-        if return_code != 0:
-            raise click.ClickException("Uploading build context failed!")
+        file_filter, ignore_file_names = await self._get_context_filter()
+        try:
+            await self._client.storage.upload_dir(
+                local_url,
+                remote_url,
+                filter=file_filter.match,
+                ignore_file_names=ignore_file_names,
+            )
+        except (OSError, apolo_sdk.ClientError) as e:
+            raise click.ClickException(f"Uploading build context failed: {e}")
+
+    async def _upload_archive_to_storage(self, local_url: URL, remote_url: URL) -> None:
+        logger.info(f"Uploading {local_url} to {remote_url}")
+        file_filter, ignore_file_names = await self._get_context_filter()
+        path = _extract_path(local_url).resolve()
+        try:
+            names = await _list_context_entries(
+                path,
+                _load_parent_ignore_files(file_filter.match, ignore_file_names, path),
+                ignore_file_names,
+            )
+            for attempt in range(CONTEXT_UPLOAD_ATTEMPTS):
+                try:
+                    await self._client.storage.create(
+                        remote_url, _iter_tar_gz(path, names)
+                    )
+                    break
+                except aiohttp.ClientError as e:
+                    if attempt + 1 == CONTEXT_UPLOAD_ATTEMPTS:
+                        raise
+                    delay = CONTEXT_UPLOAD_BACKOFF * 2**attempt
+                    logger.warning(f"Uploading {remote_url} failed: {e}, retrying")
+                    await asyncio.sleep(delay)
+        except (OSError, aiohttp.ClientError, apolo_sdk.ClientError) as e:
+            raise click.ClickException(f"Uploading build context failed: {e}")
 
     def _add_extra_kaniko_args(
         self, kaniko_args: List[str], extra_kaniko_args: Optional[str]
@@ -374,12 +610,128 @@ class RemoteImageBuilder(ImageBuilder):
             return kaniko_args
 
         extra_args = shlex.split(extra_kaniko_args)
-        kaniko_arg_keys = [arg.split("=")[0] for arg in kaniko_args]
+        # autogenerated options are all in the --key=value form
+        kaniko_arg_keys = [
+            arg.split("=")[0]
+            for arg in kaniko_args
+            if arg.startswith("--") and "=" in arg
+        ]
         extra_args_keys = [arg.split("=")[0] for arg in extra_args]
         overlap = set(extra_args_keys) & set(kaniko_arg_keys)
         if not overlap:
-            return kaniko_args + extra_args
+            kaniko_args.extend(extra_args)
+            return kaniko_args
         raise ValueError(
             f"Extra kaniko arguments {overlap} overlap with autogenerated arguments. "
             "Please remove them in order to proceed or contact the support team."
         )
+
+
+async def _iter_payload(payload: bytes) -> AsyncIterator[bytes]:
+    """Yield already encoded payload as a single chunk"""
+    yield payload
+
+
+def _load_parent_ignore_files(
+    filter: _FilterFunc, ignore_file_names: FrozenSet[str], path: Path
+) -> _FilterFunc:
+    """Add ignore files of the parent directories of the path to the filter,
+    the outermost first, the same way as Storage.upload_dir does"""
+    rel_path = ""
+    parents = []
+    while path != path.parent:
+        rel_path = f"{path.name}/{rel_path}"
+        path = path.parent
+        parents.append((path, rel_path))
+    for parent, parent_rel_path in reversed(parents):
+        for name in ignore_file_names:
+            ignore_file = parent / name
+            if ignore_file.exists():
+                file_filter = apolo_sdk.FileFilter(filter)
+                file_filter.read_from_file(ignore_file, "", parent_rel_path)
+                filter = file_filter.match
+    return filter
+
+
+async def _list_context_entries(
+    path: Path,
+    filter: _FilterFunc,
+    ignore_file_names: FrozenSet[str],
+    rel_path: str = "",
+) -> List[str]:
+    """List relative paths of files and directories in the context,
+    filtered the same way as Storage.upload_dir does"""
+    children = await asyncio.to_thread(lambda: sorted(path.iterdir()))
+    for child in children:
+        if child.name in ignore_file_names and child.is_file():
+            child_filter = apolo_sdk.FileFilter(filter)
+            child_filter.read_from_file(child, prefix=rel_path)
+            filter = child_filter.match
+    entries = []
+    for child in children:
+        child_rel_path = f"{rel_path}{child.name}"
+        if child.is_dir():
+            if await filter(f"{child_rel_path}/"):
+                entries.append(child_rel_path)
+                entries.extend(
+                    await _list_context_entries(
+                        child, filter, ignore_file_names, f"{child_rel_path}/"
+                    )
+                )
+        elif child.is_file():
+            if await filter(child_rel_path):
+                entries.append(child_rel_path)
+        else:
+            logger.warning(f"Skipping {child}, not regular file/directory")
+    return entries
+
+
+async def _iter_tar_gz(path: Path, entries: Sequence[str]) -> AsyncIterator[bytes]:
+    """Stream gzipped tar archive with the given entries of the directory,
+    the archive is written in a thread
+
+    Symlinks are stored as the files and directories they point to,
+    the same way Storage.upload_dir uploads them.
+    """
+    loop = asyncio.get_running_loop()
+    queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(maxsize=8)
+    closed = False
+
+    async def _put(chunk: Optional[bytes]) -> None:
+        if closed:
+            raise RuntimeError("Archive consumer is closed")
+        await queue.put(chunk)
+
+    class _QueueWriter:
+        def write(self, data: bytes) -> int:
+            asyncio.run_coroutine_threadsafe(_put(bytes(data)), loop).result()
+            return len(data)
+
+    def _write_archive() -> None:
+        try:
+            with tarfile.open(
+                fileobj=cast(BinaryIO, _QueueWriter()),
+                mode="w|gz",
+                bufsize=CONTEXT_ARCHIVE_CHUNK_SIZE,
+                dereference=True,
+            ) as tar:
+                for name in entries:
+                    tar.add(path / name, arcname=name, recursive=False)
+        finally:
+            asyncio.run_coroutine_threadsafe(_put(None), loop).result()
+
+    writer = asyncio.ensure_future(asyncio.to_thread(_write_archive))
+    try:
+        while True:
+            chunk = await queue.get()
+            if chunk is None:
+                break
+            yield chunk
+        await writer
+    finally:
+        if not writer.done():
+            # unblock the writer, so that it fails on the next write
+            closed = True
+            while not queue.empty():
+                queue.get_nowait()
+            await asyncio.gather(writer, return_exceptions=True)
@@ -1,17 +1,21 @@
 import asyncio
 import base64
-import json
+import io
+import os
 from pathlib import Path
 from typing import Any, Dict
 
 import click
-import yaml
 
 from .cli import main
 from .image_builder import ImageBuilder
 from .utils import get_platform_client
 
 
+# multiple of 3, so that encoded chunks concatenate without padding
+B64_CHUNK_SIZE = 57 * 1024
+
+
 @main.group()
 def k8s() -> None:
     """
@@ -24,45 +28,70 @@ def k8s() -> None:
 @click.option("--name", default="apolo")
 def generate_k8s_secret(name: str) -> None:
     payload = asyncio.run(_create_k8s_secret(name))
-    click.echo(yaml.dump(payload), nl=False)
+    click.echo(_dump_yaml(payload), nl=False)
 
 
 @k8s.command("generate-registry-secret")
 @click.option("--name", default="apolo-registry")
 def generate_k8s_registry_secret(name: str) -> None:
     payload = asyncio.run(_create_k8s_registry_secret(name))
-    click.echo(yaml.dump(payload), nl=False)
+    click.echo(_dump_yaml(payload), nl=False)
+
+
+def _dump_yaml(payload: Dict[str, Any]) -> str:
+    import yaml
+
+    # libyaml emitter, if PyYAML is built with it
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    return yaml.dump(payload, Dumper=dumper)
 
 
 async def _create_k8s_secret(name: str) -> Dict[str, Any]:
     async with get_platform_client() as client:
-        payload: Dict[str, Any] = {
-            "apiVersion": "v1",
-            "kind": "Secret",
-            "metadata": {"name": name},
-            "type": "Opaque",
-            "data": {},
-        }
         config_path = Path(client.config._path)
-        for path in config_path.iterdir():
-            if path.is_dir() or path.name in ("db-shm", "db-wal"):
-                continue
-            payload["data"][path.name] = base64.b64encode(path.read_bytes()).decode()
-        return payload
+        data = await asyncio.to_thread(_read_config_files, config_path)
+        return _secret_payload(name, "Opaque", data)
+
+
+def _secret_payload(name: str, type: str, data: Dict[str, str]) -> Dict[str, Any]:
+    """Kubernetes Secret manifest with base64-encoded data"""
+    return {
+        "apiVersion": "v1",
+        "kind": "Secret",
+        "metadata": {"name": name},
+        "type": type,
+        "data": data,
+    }
+
+
+def _read_config_files(config_path: Path) -> Dict[str, str]:
+    """Read base64-encoded files of the config directory, sorted by name"""
+    with os.scandir(config_path) as it:
+        # the type of directory entries is known without extra stat calls
+        names = sorted(
+            entry.name
+            for entry in it
+            if not entry.is_dir() and entry.name not in ("db-shm", "db-wal")
+        )
+    return {name: _b64encode_file(config_path / name) for name in names}
+
+
+def _b64encode_file(path: Path) -> str:
+    """Base64-encode the file by chunks, without reading it whole into memory"""
+    encoded = io.StringIO()
+    with path.open("rb") as f:
+        while chunk := f.read(B64_CHUNK_SIZE):
+            encoded.write(base64.b64encode(chunk).decode("ascii"))
+    return encoded.getvalue()
 
 
 async def _create_k8s_registry_secret(name: str) -> Dict[str, Any]:
     async with get_platform_client() as client:
         builder = ImageBuilder.get(local=False)(client)
         docker_config = await builder.create_docker_config()
-        return {
-            "apiVersion": "v1",
-            "kind": "Secret",
-            "metadata": {"name": name},
-            "type": "kubernetes.io/dockerconfigjson",
-            "data": {
-                ".dockerconfigjson": base64.b64encode(
-                    json.dumps(docker_config.to_primitive()).encode()
-                ).decode(),
-            },
-        }
+        encoded_config = base64.b64encode(docker_config.to_json_bytes()).decode()
+        return _secret_payload(
+            name,
+            "kubernetes.io/dockerconfigjson",
+            {".dockerconfigjson": encoded_config},
+        )
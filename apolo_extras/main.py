@@ -1,15 +1,8 @@
 import logging
 from pathlib import Path
-from typing import Any, MutableMapping
-
-import toml
+from typing import Any, Dict, MutableMapping
 
 from .cli import main
-from .config import save_registry_auth  # noqa
-from .data import data_cp, data_transfer  # noqa
-from .image import image_build, image_transfer  # noqa
-from .k8s import generate_k8s_registry_secret, generate_k8s_secret  # noqa
-from .seldon import generate_seldon_deployment, seldon_init_package  # noqa
 
 
 logger = logging.getLogger(__name__)
@@ -20,14 +13,15 @@ def init_aliases() -> None:
     """
     Create apolo CLI aliases for apolo-extras functionality.
     """
+    import toml
+
     # TODO: support patching the global ~/.neuro/user.toml
     toml_path = Path.cwd() / ".neuro.toml"
     config: MutableMapping[str, Any] = {}
     if toml_path.exists():
-        with toml_path.open("r") as f:
-            config = toml.load(f)
-    config.setdefault("alias", {})
-    config["alias"]["image-build"] = {
+        config = toml.loads(toml_path.read_text())
+    aliases: Dict[str, Any] = {}
+    aliases["image-build"] = {
         "exec": "apolo-extras image build",
         "options": [
             "-f, --file=PATH  path to the Dockerfile within CONTEXT",
@@ -44,7 +38,7 @@ def init_aliases() -> None:
             "Hit `apolo-extras image build --help` for more info."
         ),
     }
-    config["alias"]["local-build"] = {
+    aliases["local-build"] = {
         "exec": "apolo-extras image local-build",
         "options": [
             "-f, --file=PATH  path to the Dockerfile within CONTEXT",
@@ -57,11 +51,11 @@ def init_aliases() -> None:
             "Hit `apolo-extras image local-build --help` for more info."
         ),
     }
-    config["alias"]["seldon-init-package"] = {
+    aliases["seldon-init-package"] = {
         "exec": "apolo-extras seldon init-package",
         "args": "URI_OR_PATH",
     }
-    config["alias"]["image-transfer"] = {
+    aliases["image-transfer"] = {
         "exec": "apolo-extras image transfer",
         "args": "SOURCE DESTINATION",
         "options": [
@@ -72,11 +66,11 @@ def init_aliases() -> None:
             "Hit `apolo-extras image transfer --help` for more info."
         ),
     }
-    config["alias"]["data-transfer"] = {
+    aliases["data-transfer"] = {
         "exec": "apolo-extras data transfer",
         "args": "SOURCE DESTINATION",
     }
-    config["alias"]["data-cp"] = {
+    aliases["data-cp"] = {
         "exec": "apolo-extras data cp",
         "options": [
             "-c, --compress Compress source files",
@@ -89,6 +83,11 @@ def init_aliases() -> None:
         ],
         "args": "SOURCE DESTINATION",
     }
-    with toml_path.open("w") as f:
-        toml.dump(config, f)
+    existing = config.get("alias", {})
+    if all(existing.get(name) == alias for name, alias in aliases.items()):
+        # keep the file and its formatting untouched
+        logger.info(f"Aliases in {toml_path} are up to date")
+        return
+    config.setdefault("alias", {}).update(aliases)
+    toml_path.write_text(toml.dumps(config))
     logger.info(f"Added aliases to {toml_path}")
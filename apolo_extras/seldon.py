@@ -4,7 +4,6 @@ from pathlib import Path
 from typing import Any, Dict
 
 import click
-import yaml
 from yarl import URL
 
 from .cli import main
@@ -44,6 +43,8 @@ def generate_seldon_deployment(
     model_image_uri: str,
     model_storage_uri: str,
 ) -> None:
+    import yaml
+
     payload = asyncio.run(
         _create_seldon_deployment(
             name=name,
@@ -1,9 +1,14 @@
 import asyncio
+import atexit
 import logging
+import os
+import shutil
+import weakref
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
-from tempfile import TemporaryDirectory
-from typing import AsyncIterator, List, Optional
+from tempfile import mkdtemp
+from typing import AsyncIterator, Dict, List, Mapping, Optional, Tuple
 
 import apolo_sdk
 from apolo_sdk import Client
@@ -11,24 +16,129 @@ from apolo_sdk import Client
 
 logger = logging.getLogger(__name__)
 
+# the first preset of each of the clients
+_DEFAULT_PRESET_CACHE: "weakref.WeakKeyDictionary[Client, str]" = (
+    weakref.WeakKeyDictionary()
+)
+# scratch directories of this process, by their parent directory
+_PROCESS_TEMP_DIRS: Dict[Path, Path] = {}
+
 
 class CLIRunner:
     """Utility class for running shell commands"""
 
-    async def run_command(self, command: str, args: List[str]) -> None:
+    async def run_command(
+        self, command: str, args: List[str], env: Optional[Mapping[str, str]] = None
+    ) -> None:
         """Execute command with args
 
-        If resulting statuscode is non-zero, RuntimeError is thrown
-        with stderr as a message.
+        If env is provided, it replaces the environment of the command.
+        If resulting statuscode is non-zero, RuntimeError is thrown.
+        If the call is cancelled, the command is killed.
         """
         logger.info(f"Executing: {[command] + args}")
-        # logger.warn(f"Calling echo instead of actual command!")
-        # process = await asyncio.create_subprocess_exec("echo", *([command] + args))
-
-        process = await asyncio.create_subprocess_exec(command, *args)
-        status_code = await process.wait()
+        process = await asyncio.create_subprocess_exec(
+            _resolve_executable(command), *args, env=env
+        )
+        try:
+            status_code = await process.wait()
+        except asyncio.CancelledError:
+            # don't leave the command writing into the data of a cancelled copy
+            await _kill_process(process)
+            raise
         if status_code != 0:
-            raise RuntimeError(process.stderr)
+            raise RuntimeError(f"{command} exited with {status_code}")
+
+    async def run_pipeline(
+        self,
+        producer: Tuple[str, List[str]],
+        consumer: Tuple[str, List[str]],
+        producer_env: Optional[Mapping[str, str]] = None,
+        consumer_env: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        """Execute two commands concurrently, piping stdout of the producer
+        into stdin of the consumer
+
+        If producer_env or consumer_env is provided, it replaces the environment
+        of the respective command.
+        If the producer fails, the consumer is killed before it reaches the end
+        of the input, so e.g. an upload of a truncated archive is never completed.
+        If any of the resulting statuscodes is non-zero, RuntimeError is thrown.
+        """
+        producer_command, producer_args = producer
+        consumer_command, consumer_args = consumer
+        logger.info(
+            f"Executing: {[producer_command] + producer_args} "
+            f"| {[consumer_command] + consumer_args}"
+        )
+        read_fd, write_fd = os.pipe()
+        try:
+            producer_process = await asyncio.create_subprocess_exec(
+                _resolve_executable(producer_command),
+                *producer_args,
+                stdout=write_fd,
+                env=producer_env,
+            )
+        except BaseException:
+            os.close(read_fd)
+            os.close(write_fd)
+            raise
+        try:
+            consumer_process = await asyncio.create_subprocess_exec(
+                _resolve_executable(consumer_command),
+                *consumer_args,
+                stdin=read_fd,
+                env=consumer_env,
+            )
+        except BaseException:
+            os.close(write_fd)
+            await _kill_process(producer_process)
+            raise
+        finally:
+            os.close(read_fd)
+        try:
+            # the write end is kept open here, so the consumer doesn't see
+            # the end of the input until the producer has succeeded
+            producer_status = await producer_process.wait()
+            if producer_status != 0:
+                await _kill_process(consumer_process)
+        except asyncio.CancelledError:
+            await asyncio.gather(
+                _kill_process(producer_process), _kill_process(consumer_process)
+            )
+            raise
+        finally:
+            os.close(write_fd)
+        try:
+            consumer_status = await consumer_process.wait()
+        except asyncio.CancelledError:
+            await _kill_process(consumer_process)
+            raise
+        if producer_status != 0 or consumer_status != 0:
+            raise RuntimeError(
+                f"Pipeline failed: {producer_command} exited with {producer_status}, "
+                f"{consumer_command} exited with {consumer_status}"
+            )
+
+
+async def _kill_process(process: asyncio.subprocess.Process) -> None:
+    """Kill the process, unless it has already exited, and reap it"""
+    if process.returncode is None:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+    await process.wait()
+
+
+@lru_cache(maxsize=None)
+def _resolve_executable(command: str) -> str:
+    """Resolve command into full path to the executable once per process
+
+    Falls back to the bare command, so the missing executable is reported
+    when the process is spawned.
+    """
+    return shutil.which(command) or command
 
 
 @asynccontextmanager
@@ -73,16 +183,23 @@ async def get_platform_client(
 
 
 def select_job_preset(
-    preset: Optional[str], client: Client, min_cpu: float = 2, min_mem: int = 4096
+    preset: Optional[str],
+    client: Client,
+    min_cpu: float = 2,
+    min_mem: int = 4096,
+    fallback_to_default: bool = False,
 ) -> Optional[str]:
     """
     Try to automatically select the best available preset for a task.
     Memory is specified in mebibytes.
+    If no preset fits and fallback_to_default is set, the default
+    (first) cluster preset is returned instead of None.
     """
+    presets = client.presets
     good_presets = []
     good_presets_names = []
     # Build a shortlist of presets that could fit
-    for cluster_preset_name, cluster_preset_info in client.presets.items():
+    for cluster_preset_name, cluster_preset_info in presets.items():
         # Don't even try to use GPU machines for image builds
         # Also ignore scheduled presets (they don't work with schedule-timeout)
         # see https://github.com/neuro-inc/neuro-extras/issues/488
@@ -111,6 +228,8 @@ def select_job_preset(
                 "Consider contacting your cluster manager or admin "
                 "to adjust the cluster configuration"
             )
+            if fallback_to_default and presets:
+                return get_default_preset(client)
             return None
     else:
         if preset in good_presets_names:
@@ -128,13 +247,33 @@ def select_job_preset(
 
 
 def get_default_preset(apolo_client: Client) -> str:
-    """Get default preset name via Neu.ro client"""
-    return next(iter(apolo_client.presets.keys()))
+    """Get default preset name via Neu.ro client, resolved once per client"""
+    preset_name = _DEFAULT_PRESET_CACHE.get(apolo_client)
+    if preset_name is None:
+        preset_name = next(iter(apolo_client.presets))
+        _DEFAULT_PRESET_CACHE[apolo_client] = preset_name
+    return preset_name
 
 
-def provide_temp_dir(
+@asynccontextmanager
+async def provide_temp_dir(
     dir: Path = Path.home() / ".apolo-tmp",
-) -> TemporaryDirectory:  # type: ignore
-    """Provide temp directory"""
-    dir.mkdir(exist_ok=True, parents=True)
-    return TemporaryDirectory(dir=dir)
+) -> AsyncIterator[str]:
+    """Provide temp directory
+
+    Temp directories are created inside a scratch directory of the process,
+    which is removed at exit together with anything left behind.
+    Removal of the temp directory runs in a thread, since extracted
+    trees can be large.
+    """
+    process_dir = _PROCESS_TEMP_DIRS.get(dir)
+    if process_dir is None:
+        dir.mkdir(exist_ok=True, parents=True)
+        process_dir = Path(mkdtemp(prefix="apolo-extras-", dir=dir))
+        atexit.register(shutil.rmtree, process_dir, ignore_errors=True)
+        _PROCESS_TEMP_DIRS[dir] = process_dir
+    temp_dir = mkdtemp(dir=process_dir)
+    try:
+        yield temp_dir
+    finally:
+        await asyncio.to_thread(shutil.rmtree, temp_dir, ignore_errors=True)
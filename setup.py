@@ -21,6 +21,7 @@ setup(
     packages=find_packages(),
     install_requires=[
         "apolo-cli>=24.10.1",
+        "aiohttp>=3.8",
         "click>=8.0",
         "toml>=0.10.0",
         "pyyaml>=3.0",
@@ -102,10 +102,33 @@ async def _apolo_client() -> t.AsyncGenerator[apolo_sdk.Client, None]:
         stack.enter_context(
             mock.patch("apolo_sdk._storage.Storage.create", mock.AsyncMock())
         )
+        stack.enter_context(
+            mock.patch("apolo_sdk._storage.Storage.upload_dir", mock.AsyncMock())
+        )
+        stack.enter_context(
+            mock.patch(
+                "apolo_sdk._storage.Storage.stat",
+                mock.AsyncMock(side_effect=apolo_sdk.ResourceNotFound),
+            )
+        )
         stack.enter_context(
             mock.patch("apolo_extras.image._check_image_exists", return_value=False)
         )
-        stack.enter_context(mock.patch("uuid.uuid4", return_value="mocked-uuid-4"))
+        stack.enter_context(
+            mock.patch(
+                "apolo_sdk._jobs.Jobs.start",
+                mock.AsyncMock(return_value=mock.Mock(id="job-mocked")),
+            )
+        )
+        stack.enter_context(
+            mock.patch(
+                "apolo_extras.image_builder._attach_job_stdout",
+                mock.AsyncMock(return_value=0),
+            )
+        )
+        stack.enter_context(
+            mock.patch("secrets.token_hex", return_value="mocked-token")
+        )
         client = await apolo_sdk.get()
         try:
             yield await client.__aenter__()
@@ -1,17 +1,85 @@
+import io
+import json
+import shlex
+import tarfile
 from pathlib import Path
+from typing import Any, Dict, List, Set
 from unittest import mock
 
+import aiohttp
+import apolo_sdk
 import pytest
 from yarl import URL
 
 from apolo_extras.image import _build_image
-from apolo_extras.image_builder import ImageBuilder
+from apolo_extras.image_builder import (
+    ImageBuilder,
+    _iter_tar_gz,
+    _list_context_entries,
+    _load_parent_ignore_files,
+)
+
+
+def _get_builder_job_kwargs(builder: ImageBuilder) -> Dict[str, Any]:
+    jobs_start_mock: mock.AsyncMock = builder._client.jobs.start  # type: ignore
+    jobs_start_mock.assert_awaited_once()
+    assert jobs_start_mock.await_args is not None
+    job_kwargs = jobs_start_mock.await_args.kwargs
+    assert job_kwargs["image"] == builder._client.parse.remote_image(
+        "gcr.io/kaniko-project/executor:v1.20.0-debug"
+    )
+    assert job_kwargs["life_span"] == 4 * 60 * 60
+    assert job_kwargs["schedule_timeout"] == 20 * 60
+    return dict(job_kwargs)
+
+
+@pytest.fixture
+def build_context(tmp_path: Path) -> Path:
+    context = tmp_path / "context"
+    (context / "path" / "to").mkdir(parents=True)
+    (context / "path" / "to" / "Dockerfile").write_text("FROM ubuntu\n")
+    (context / "path" / "to" / "build.log").write_text("ignored\n")
+    (context / ".neuroignore").write_text("*.log\n.neuroignore\n")
+    return context
+
+
+async def _read_archive_chunks(create_call: Any) -> List[str]:
+    payload = b"".join([chunk async for chunk in create_call[0][1]])
+    with tarfile.open(fileobj=io.BytesIO(payload), mode="r:gz") as tar:
+        return tar.getnames()
+
+
+def _parse_volumes(builder: ImageBuilder, volumes: List[str]) -> List[Any]:
+    return list(builder._client.parse.volumes(volumes).volumes)
+
+
+def _get_docker_config_uri(builder: ImageBuilder, project_name: str) -> URL:
+    storage_create_mock: mock.AsyncMock = builder._client.storage.create  # type: ignore
+    (uri,) = [
+        call[0][0]
+        for call in storage_create_mock.await_args_list
+        if call[0][0].parent.name == "auths"
+    ]
+    assert uri.parent == URL(f"storage://mycluster/{project_name}/.builds/auths")
+    assert uri.suffix == ".json"
+    return uri
+
+
+async def _read_context_archive(builder: ImageBuilder, build_root: URL) -> List[str]:
+    storage_create_mock: mock.AsyncMock = builder._client.storage.create  # type: ignore
+    (create_call,) = [
+        call
+        for call in storage_create_mock.await_args_list
+        if call[0][0] == build_root / "context.tar.gz"
+    ]
+    return await _read_archive_chunks(create_call)
 
 
 async def test_image_builder__min_parameters(
     remote_image_builder: ImageBuilder,
+    build_context: Path,
 ) -> None:
-    context = "/path/to/context"
+    context = str(build_context)
 
     await _build_image(
         dockerfile_path=Path("path/to/Dockerfile"),
@@ -26,49 +94,44 @@ async def test_image_builder__min_parameters(
     )
 
     expected_storage_build_root = URL(
-        "storage://mycluster/myproject/.builds/mocked-uuid-4"
+        "storage://mycluster/myproject/.builds/mocked-token"
     )
     storage_mkdir_mock: mock.AsyncMock = remote_image_builder._client.storage.mkdir  # type: ignore # noqa: E501
-    storage_mkdir_mock.assert_awaited_once_with(
-        expected_storage_build_root, parents=True
-    )
+    docker_config_uri = _get_docker_config_uri(remote_image_builder, "myproject")
+    assert storage_mkdir_mock.await_args_list == [
+        mock.call(expected_storage_build_root, parents=True),
+        mock.call(docker_config_uri.parent, parents=True, exist_ok=True),
+    ]
     storage_create_mock: mock.AsyncMock = remote_image_builder._client.storage.create  # type: ignore # noqa: E501
-    storage_create_mock.assert_awaited_once_with(
-        expected_storage_build_root / ".docker.config.json",
-        mock.ANY,
-    )
-    subproc_mock: mock.AsyncMock = remote_image_builder._execute_subprocess  # type: ignore # noqa: E501
-    assert subproc_mock.await_count == 2
-    upload_ctx_cmd = subproc_mock.await_args_list[0][0][0]
-    assert upload_ctx_cmd == [
-        "apolo",
-        "--disable-pypi-version-check",
-        "cp",
-        "--recursive",
-        Path(context).resolve().as_uri(),
-        str(expected_storage_build_root / "context"),
+    assert storage_create_mock.await_count == 2
+    assert await _read_context_archive(
+        remote_image_builder, expected_storage_build_root
+    ) == [
+        "path",
+        "path/to",
+        "path/to/Dockerfile",
     ]
-    start_build_cmd = subproc_mock.await_args_list[1][0][0]
-    start_build_apolo_args = start_build_cmd[: start_build_cmd.index("--")]
-    start_build_job_arg = start_build_cmd[start_build_cmd.index("--") + 1 :][0]
-    start_build_kaniko_args = start_build_job_arg.split(" ")
-    assert start_build_apolo_args == [
-        "apolo",
-        "--disable-pypi-version-check",
-        "job",
-        "run",
-        "--life-span=4h",
-        "--schedule-timeout=20m",
-        "--project=myproject",
-        "--tag=kaniko-builds-image:image://mycluster/myproject/targetimage:latest",
-        "--volume=storage://mycluster/myproject/.builds/mocked-uuid-4/.docker.config.json:/kaniko/.docker/config.json:ro",  # noqa: E501
-        "--volume=storage://mycluster/myproject/.builds/mocked-uuid-4/context:/kaniko_context:rw",  # noqa: E501
-        "--env=container=docker",
-        "gcr.io/kaniko-project/executor:v1.20.0-debug",
+    storage_upload_mock: mock.AsyncMock = remote_image_builder._client.storage.upload_dir  # type: ignore # noqa: E501
+    storage_upload_mock.assert_not_awaited()
+    job_kwargs = _get_builder_job_kwargs(remote_image_builder)
+    assert job_kwargs["preset_name"] == "cpu-small"
+    assert job_kwargs["project_name"] == "myproject"
+    assert job_kwargs["tags"] == [
+        "kaniko-builds-image:image://mycluster/myproject/targetimage:latest",
     ]
+    assert job_kwargs["volumes"] == _parse_volumes(
+        remote_image_builder,
+        [
+            f"{docker_config_uri}:/kaniko/.docker/config.json:ro",
+            "storage://mycluster/myproject/.builds/mocked-token/context.tar.gz:/kaniko_context.tar.gz:ro",  # noqa: E501
+        ],
+    )
+    assert job_kwargs["env"] == {"container": "docker"}
+    assert job_kwargs["entrypoint"] is None
+    start_build_kaniko_args = job_kwargs["command"].split(" ")
     assert start_build_kaniko_args == [
-        "--context=/kaniko_context",
-        "--dockerfile=/kaniko_context/path/to/Dockerfile",
+        "--context=tar:///kaniko_context.tar.gz",
+        "--dockerfile=path/to/Dockerfile",
         "--destination=registry.mycluster.noexists/myproject/targetimage:latest",
         "--cache=true",
         "--cache-repo=registry.mycluster.noexists/myproject/layer-cache/cache",
@@ -82,8 +145,9 @@ async def test_image_builder__min_parameters(
 
 async def test_image_builder__full_parameters(
     remote_image_builder: ImageBuilder,
+    build_context: Path,
 ) -> None:
-    context = "/path/to/context"
+    context = str(build_context)
 
     await _build_image(
         dockerfile_path=Path("path/to/Dockerfile"),
@@ -104,56 +168,48 @@ async def test_image_builder__full_parameters(
     )
 
     expected_storage_build_root = URL(
-        "storage://mycluster/myproject/.builds/mocked-uuid-4"
+        "storage://mycluster/myproject/.builds/mocked-token"
     )
     storage_mkdir_mock: mock.AsyncMock = remote_image_builder._client.storage.mkdir  # type: ignore # noqa: E501
-    storage_mkdir_mock.assert_awaited_once_with(
-        expected_storage_build_root, parents=True
-    )
+    docker_config_uri = _get_docker_config_uri(remote_image_builder, "myproject")
+    assert storage_mkdir_mock.await_args_list == [
+        mock.call(expected_storage_build_root, parents=True),
+        mock.call(docker_config_uri.parent, parents=True, exist_ok=True),
+    ]
     storage_create_mock: mock.AsyncMock = remote_image_builder._client.storage.create  # type: ignore # noqa: E501
-    storage_create_mock.assert_awaited_once_with(
-        expected_storage_build_root / ".docker.config.json",
-        mock.ANY,
-    )
-    subproc_mock: mock.AsyncMock = remote_image_builder._execute_subprocess  # type: ignore # noqa: E501
-    assert subproc_mock.await_count == 2
-    upload_ctx_cmd = subproc_mock.await_args_list[0][0][0]
-    assert upload_ctx_cmd == [
-        "apolo",
-        "--disable-pypi-version-check",
-        "cp",
-        "--recursive",
-        Path(context).resolve().as_uri(),
-        str(expected_storage_build_root / "context"),
+    assert storage_create_mock.await_count == 2
+    assert await _read_context_archive(
+        remote_image_builder, expected_storage_build_root
+    ) == [
+        "path",
+        "path/to",
+        "path/to/Dockerfile",
     ]
-    start_build_cmd = subproc_mock.await_args_list[1][0][0]
-    start_build_apolo_args = start_build_cmd[: start_build_cmd.index("--")]
-    start_build_job_arg = start_build_cmd[start_build_cmd.index("--") + 1 :][0]
-    start_build_kaniko_args = start_build_job_arg.split(" ")
-    assert start_build_apolo_args == [
-        "apolo",
-        "--disable-pypi-version-check",
-        "job",
-        "run",
-        "--life-span=4h",
-        "--schedule-timeout=20m",
-        "--project=myproject",
-        "--preset=custom-preset",
-        "--tag=tag1",
-        "--tag=tag2",
-        "--tag=kaniko-builds-image:image://mycluster/myproject/targetimage:latest",
-        "--volume=storage:somevol:/mnt/vol1",
-        "--volume=storage:/someproject2/somevol2:/mnt/vol2",
-        "--volume=storage://mycluster/myproject/.builds/mocked-uuid-4/.docker.config.json:/kaniko/.docker/config.json:ro",  # noqa: E501
-        "--volume=storage://mycluster/myproject/.builds/mocked-uuid-4/context:/kaniko_context:rw",  # noqa: E501
-        "--env=ENV1=VAL1",
-        "--env=ENV2=VAL2",
-        "--env=container=docker",
-        "gcr.io/kaniko-project/executor:v1.20.0-debug",
+    storage_upload_mock: mock.AsyncMock = remote_image_builder._client.storage.upload_dir  # type: ignore # noqa: E501
+    storage_upload_mock.assert_not_awaited()
+    job_kwargs = _get_builder_job_kwargs(remote_image_builder)
+    assert job_kwargs["preset_name"] == "custom-preset"
+    assert job_kwargs["project_name"] == "myproject"
+    assert job_kwargs["tags"] == [
+        "tag1",
+        "tag2",
+        "kaniko-builds-image:image://mycluster/myproject/targetimage:latest",
     ]
+    assert job_kwargs["volumes"] == _parse_volumes(
+        remote_image_builder,
+        [
+            "storage:somevol:/mnt/vol1",
+            "storage:/someproject2/somevol2:/mnt/vol2",
+            f"{docker_config_uri}:/kaniko/.docker/config.json:ro",
+            "storage://mycluster/myproject/.builds/mocked-token/context.tar.gz:/kaniko_context.tar.gz:ro",  # noqa: E501
+        ],
+    )
+    assert job_kwargs["env"] == {"ENV1": "VAL1", "ENV2": "VAL2", "container": "docker"}
+    assert job_kwargs["entrypoint"] is None
+    start_build_kaniko_args = job_kwargs["command"].split(" ")
     assert start_build_kaniko_args == [
-        "--context=/kaniko_context",
-        "--dockerfile=/kaniko_context/path/to/Dockerfile",
+        "--context=tar:///kaniko_context.tar.gz",
+        "--dockerfile=path/to/Dockerfile",
         "--destination=registry.mycluster.noexists/myproject/targetimage:latest",
         "--cache=true",
         "--cache-repo=registry.mycluster.noexists/myproject/layer-cache/cache",
@@ -177,6 +233,7 @@ async def test_image_builder__full_parameters(
 
 async def test_image_builder__conflicting_kaniko_args(
     remote_image_builder: ImageBuilder,
+    build_context: Path,
 ) -> None:
     with pytest.raises(
         ValueError,
@@ -188,7 +245,7 @@ async def test_image_builder__conflicting_kaniko_args(
     ):
         await _build_image(
             dockerfile_path=Path("path/to/Dockerfile"),
-            context="/path/to/context",
+            context=str(build_context),
             image_uri_str="image:targetimage:latest",
             use_cache=True,
             build_args=(),
@@ -204,8 +261,9 @@ async def test_image_builder__conflicting_kaniko_args(
 
 async def test_image_builder__custom_project(
     remote_image_builder: ImageBuilder,
+    build_context: Path,
 ) -> None:
-    context = "/path/to/context"
+    context = str(build_context)
     await _build_image(
         dockerfile_path=Path("path/to/Dockerfile"),
         context=context,
@@ -220,49 +278,44 @@ async def test_image_builder__custom_project(
     )
 
     expected_storage_build_root = URL(
-        "storage://mycluster/otherproject/.builds/mocked-uuid-4"
+        "storage://mycluster/otherproject/.builds/mocked-token"
     )
     storage_mkdir_mock: mock.AsyncMock = remote_image_builder._client.storage.mkdir  # type: ignore # noqa: E501
-    storage_mkdir_mock.assert_awaited_once_with(
-        expected_storage_build_root, parents=True
-    )
+    docker_config_uri = _get_docker_config_uri(remote_image_builder, "otherproject")
+    assert storage_mkdir_mock.await_args_list == [
+        mock.call(expected_storage_build_root, parents=True),
+        mock.call(docker_config_uri.parent, parents=True, exist_ok=True),
+    ]
     storage_create_mock: mock.AsyncMock = remote_image_builder._client.storage.create  # type: ignore # noqa: E501
-    storage_create_mock.assert_awaited_once_with(
-        expected_storage_build_root / ".docker.config.json",
-        mock.ANY,
-    )
-    subproc_mock: mock.AsyncMock = remote_image_builder._execute_subprocess  # type: ignore # noqa: E501
-    assert subproc_mock.await_count == 2
-    upload_ctx_cmd = subproc_mock.await_args_list[0][0][0]
-    assert upload_ctx_cmd == [
-        "apolo",
-        "--disable-pypi-version-check",
-        "cp",
-        "--recursive",
-        Path(context).resolve().as_uri(),
-        str(expected_storage_build_root / "context"),
+    assert storage_create_mock.await_count == 2
+    assert await _read_context_archive(
+        remote_image_builder, expected_storage_build_root
+    ) == [
+        "path",
+        "path/to",
+        "path/to/Dockerfile",
     ]
-    start_build_cmd = subproc_mock.await_args_list[1][0][0]
-    start_build_apolo_args = start_build_cmd[: start_build_cmd.index("--")]
-    start_build_job_arg = start_build_cmd[start_build_cmd.index("--") + 1 :][0]
-    start_build_kaniko_args = start_build_job_arg.split(" ")
-    assert start_build_apolo_args == [
-        "apolo",
-        "--disable-pypi-version-check",
-        "job",
-        "run",
-        "--life-span=4h",
-        "--schedule-timeout=20m",
-        "--project=otherproject",
-        "--tag=kaniko-builds-image:image://mycluster/otherproject/targetimage:latest",
-        "--volume=storage://mycluster/otherproject/.builds/mocked-uuid-4/.docker.config.json:/kaniko/.docker/config.json:ro",  # noqa: E501
-        "--volume=storage://mycluster/otherproject/.builds/mocked-uuid-4/context:/kaniko_context:rw",  # noqa: E501
-        "--env=container=docker",
-        "gcr.io/kaniko-project/executor:v1.20.0-debug",
+    storage_upload_mock: mock.AsyncMock = remote_image_builder._client.storage.upload_dir  # type: ignore # noqa: E501
+    storage_upload_mock.assert_not_awaited()
+    job_kwargs = _get_builder_job_kwargs(remote_image_builder)
+    assert job_kwargs["preset_name"] == "cpu-small"
+    assert job_kwargs["project_name"] == "otherproject"
+    assert job_kwargs["tags"] == [
+        "kaniko-builds-image:image://mycluster/otherproject/targetimage:latest",
     ]
+    assert job_kwargs["volumes"] == _parse_volumes(
+        remote_image_builder,
+        [
+            f"{docker_config_uri}:/kaniko/.docker/config.json:ro",
+            "storage://mycluster/otherproject/.builds/mocked-token/context.tar.gz:/kaniko_context.tar.gz:ro",  # noqa: E501
+        ],
+    )
+    assert job_kwargs["env"] == {"container": "docker"}
+    assert job_kwargs["entrypoint"] is None
+    start_build_kaniko_args = job_kwargs["command"].split(" ")
     assert start_build_kaniko_args == [
-        "--context=/kaniko_context",
-        "--dockerfile=/kaniko_context/path/to/Dockerfile",
+        "--context=tar:///kaniko_context.tar.gz",
+        "--dockerfile=path/to/Dockerfile",
         "--destination=registry.mycluster.noexists/otherproject/targetimage:latest",
         "--cache=true",
         "--cache-repo=registry.mycluster.noexists/otherproject/layer-cache/cache",
@@ -291,37 +344,32 @@ async def test_image_builder__storage_context(
     )
 
     expected_storage_build_root = URL(
-        "storage://mycluster/myproject/.builds/mocked-uuid-4"
+        "storage://mycluster/myproject/.builds/mocked-token"
     )
     storage_mkdir_mock: mock.AsyncMock = remote_image_builder._client.storage.mkdir  # type: ignore # noqa: E501
-    storage_mkdir_mock.assert_awaited_once_with(
-        expected_storage_build_root, parents=True
-    )
+    docker_config_uri = _get_docker_config_uri(remote_image_builder, "myproject")
+    assert storage_mkdir_mock.await_args_list == [
+        mock.call(expected_storage_build_root, parents=True),
+        mock.call(docker_config_uri.parent, parents=True, exist_ok=True),
+    ]
     storage_create_mock: mock.AsyncMock = remote_image_builder._client.storage.create  # type: ignore # noqa: E501
-    storage_create_mock.assert_awaited_once_with(
-        expected_storage_build_root / ".docker.config.json",
-        mock.ANY,
-    )
-    subproc_mock: mock.AsyncMock = remote_image_builder._execute_subprocess  # type: ignore # noqa: E501
-    assert subproc_mock.await_count == 1
-    start_build_cmd = subproc_mock.await_args_list[0][0][0]
-    start_build_apolo_args = start_build_cmd[: start_build_cmd.index("--")]
-    start_build_job_arg = start_build_cmd[start_build_cmd.index("--") + 1 :][0]
-    start_build_kaniko_args = start_build_job_arg.split(" ")
-    assert start_build_apolo_args == [
-        "apolo",
-        "--disable-pypi-version-check",
-        "job",
-        "run",
-        "--life-span=4h",
-        "--schedule-timeout=20m",
-        "--project=myproject",
-        "--tag=kaniko-builds-image:image://mycluster/myproject/targetimage:latest",
-        "--volume=storage://mycluster/myproject/.builds/mocked-uuid-4/.docker.config.json:/kaniko/.docker/config.json:ro",  # noqa: E501
-        "--volume=storage://mycluster/myproject/context:/kaniko_context:rw",
-        "--env=container=docker",
-        "gcr.io/kaniko-project/executor:v1.20.0-debug",
+    storage_create_mock.assert_awaited_once_with(docker_config_uri, mock.ANY)
+    job_kwargs = _get_builder_job_kwargs(remote_image_builder)
+    assert job_kwargs["preset_name"] == "cpu-small"
+    assert job_kwargs["project_name"] == "myproject"
+    assert job_kwargs["tags"] == [
+        "kaniko-builds-image:image://mycluster/myproject/targetimage:latest",
     ]
+    assert job_kwargs["volumes"] == _parse_volumes(
+        remote_image_builder,
+        [
+            f"{docker_config_uri}:/kaniko/.docker/config.json:ro",
+            "storage://mycluster/myproject/context:/kaniko_context:rw",
+        ],
+    )
+    assert job_kwargs["env"] == {"container": "docker"}
+    assert job_kwargs["entrypoint"] is None
+    start_build_kaniko_args = job_kwargs["command"].split(" ")
     assert start_build_kaniko_args == [
         "--context=/kaniko_context",
         "--dockerfile=/kaniko_context/path/to/Dockerfile",
@@ -334,3 +382,224 @@ async def test_image_builder__storage_context(
         "--use-new-run=true",
         "--snapshot-mode=redo",
     ]
+
+
+async def test_image_builder__inline_registry_auth(
+    remote_image_builder: ImageBuilder,
+) -> None:
+    extra_auth = {"auths": {"other.registry": {"auth": "b3RoZXI6dG9rZW4="}}}
+
+    await _build_image(
+        dockerfile_path=Path("path/to/Dockerfile"),
+        context="storage:/myproject/context",
+        image_uri_str="image:targetimage:latest",
+        use_cache=True,
+        build_args=(),
+        volume=(),
+        env=(f"NE_REGISTRY_AUTH_OTHER={json.dumps(extra_auth)}",),
+        build_tags=(),
+        force_overwrite=False,
+    )
+
+    storage_create_mock: mock.AsyncMock = remote_image_builder._client.storage.create  # type: ignore # noqa: E501
+    docker_config_uri = _get_docker_config_uri(remote_image_builder, "myproject")
+    storage_create_mock.assert_awaited_once()
+    assert storage_create_mock.await_args is not None
+    payload = b"".join([chunk async for chunk in storage_create_mock.await_args[0][1]])
+    auths = json.loads(payload)["auths"]
+    assert set(auths) == {"registry.mycluster.noexists", "other.registry"}
+    assert auths["other.registry"] == extra_auth["auths"]["other.registry"]
+    job_kwargs = _get_builder_job_kwargs(remote_image_builder)
+    assert job_kwargs["entrypoint"] is None
+    assert job_kwargs["env"] == {"container": "docker"}
+    assert job_kwargs["volumes"] == _parse_volumes(
+        remote_image_builder,
+        [
+            f"{docker_config_uri}:/kaniko/.docker/config.json:ro",
+            "storage://mycluster/myproject/context:/kaniko_context:rw",
+        ],
+    )
+
+
+async def test_image_builder__volume_in_context(
+    remote_image_builder: ImageBuilder,
+    build_context: Path,
+) -> None:
+    await _build_image(
+        dockerfile_path=Path("path/to/Dockerfile"),
+        context=str(build_context),
+        image_uri_str="image:targetimage:latest",
+        use_cache=True,
+        build_args=(),
+        volume=("secret:mysecret:/kaniko_context/secret.txt",),
+        env=(),
+        build_tags=(),
+        force_overwrite=False,
+    )
+
+    expected_storage_build_root = URL(
+        "storage://mycluster/myproject/.builds/mocked-token"
+    )
+    storage_upload_mock: mock.AsyncMock = remote_image_builder._client.storage.upload_dir  # type: ignore # noqa: E501
+    storage_upload_mock.assert_awaited_once_with(
+        URL(build_context.resolve().as_uri()),
+        expected_storage_build_root / "context",
+        filter=mock.ANY,
+        ignore_file_names=frozenset([".neuroignore"]),
+    )
+    docker_config_uri = _get_docker_config_uri(remote_image_builder, "myproject")
+    job_kwargs = _get_builder_job_kwargs(remote_image_builder)
+    assert job_kwargs["volumes"] == _parse_volumes(
+        remote_image_builder,
+        [
+            f"{docker_config_uri}:/kaniko/.docker/config.json:ro",
+            "storage://mycluster/myproject/.builds/mocked-token/context:/kaniko_context:rw",  # noqa: E501
+        ],
+    )
+    start_build_kaniko_args = job_kwargs["command"].split(" ")
+    assert start_build_kaniko_args[:2] == [
+        "--context=/kaniko_context",
+        "--dockerfile=/kaniko_context/path/to/Dockerfile",
+    ]
+
+
+async def test_image_builder__context_upload_retry(
+    remote_image_builder: ImageBuilder,
+    build_context: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr("apolo_extras.image_builder.CONTEXT_UPLOAD_BACKOFF", 0)
+    archive_chunks = []
+
+    async def _create(uri: URL, data: Any) -> None:
+        if uri.name == "context.tar.gz":
+            archive_chunks.append([chunk async for chunk in data])
+            if len(archive_chunks) == 1:
+                raise aiohttp.ClientConnectionError("Connection reset")
+
+    storage_create_mock: mock.AsyncMock = remote_image_builder._client.storage.create  # type: ignore # noqa: E501
+    storage_create_mock.side_effect = _create
+
+    await _build_image(
+        dockerfile_path=Path("path/to/Dockerfile"),
+        context=str(build_context),
+        image_uri_str="image:targetimage:latest",
+        use_cache=True,
+        build_args=(),
+        volume=(),
+        env=(),
+        build_tags=(),
+        force_overwrite=False,
+    )
+
+    assert storage_create_mock.await_count == 3
+    assert len(archive_chunks) == 2
+    assert archive_chunks[0] == archive_chunks[1]
+
+
+async def test_image_builder__docker_config_uploaded_once(
+    remote_image_builder: ImageBuilder,
+) -> None:
+    client = remote_image_builder._client
+    created: Set[URL] = set()
+
+    async def _create(uri: URL, data: Any) -> None:
+        created.add(uri)
+
+    async def _stat(uri: URL) -> Any:
+        if uri not in created:
+            raise apolo_sdk.ResourceNotFound(str(uri))
+        return mock.Mock()
+
+    storage_create_mock: mock.AsyncMock = client.storage.create  # type: ignore
+    storage_create_mock.side_effect = _create
+    storage_stat_mock: mock.AsyncMock = client.storage.stat  # type: ignore
+    storage_stat_mock.side_effect = _stat
+    # builders are created per build, the uploaded config is found on storage
+    for _ in range(2):
+        builder = ImageBuilder.get(local=False)(client=client)
+        await builder.build(
+            dockerfile_path=Path("Dockerfile"),
+            context_uri=client.parse.str_to_uri("storage:context"),
+            image=client.parse.remote_image("image:targetimage:latest"),
+            use_cache=True,
+            build_args=(),
+            volumes=(),
+            envs=(),
+            job_preset=None,
+            build_tags=(),
+            project_name="myproject",
+            extra_kaniko_args=None,
+        )
+
+    storage_create_mock.assert_awaited_once()
+    assert storage_stat_mock.await_count == 2
+    jobs_start_mock: mock.AsyncMock = client.jobs.start  # type: ignore
+    assert jobs_start_mock.await_count == 2
+    first_job, second_job = jobs_start_mock.await_args_list
+    assert first_job.kwargs["volumes"] == second_job.kwargs["volumes"]
+
+
+async def test_image_builder__build_arg_with_spaces(
+    remote_image_builder: ImageBuilder,
+) -> None:
+    await _build_image(
+        dockerfile_path=Path("path/to/Dockerfile"),
+        context="storage:context",
+        image_uri_str="image:targetimage:latest",
+        use_cache=True,
+        build_args=("MESSAGE=hello world",),
+        volume=(),
+        env=(),
+        build_tags=(),
+        extra_kaniko_args="--build-arg 'OTHER=good bye' --label=x",
+        force_overwrite=False,
+    )
+
+    job_kwargs = _get_builder_job_kwargs(remote_image_builder)
+    assert shlex.split(job_kwargs["command"])[-5:] == [
+        "--build-arg",
+        "MESSAGE=hello world",
+        "--build-arg",
+        "OTHER=good bye",
+        "--label=x",
+    ]
+
+
+async def test_context_entries_use_parent_ignore_files(build_context: Path) -> None:
+    (build_context.parent / ".neuroignore").write_text("context/path/*/Dockerfile\n")
+    (build_context / "path" / "to" / "main.py").write_text("print()\n")
+    ignore_file_names = frozenset({".neuroignore"})
+
+    file_filter = _load_parent_ignore_files(
+        apolo_sdk.FileFilter().match, ignore_file_names, build_context
+    )
+    names = await _list_context_entries(build_context, file_filter, ignore_file_names)
+
+    assert names == ["path", "path/to", "path/to/main.py"]
+
+
+async def test_context_archive_follows_symlinks(
+    build_context: Path, tmp_path: Path
+) -> None:
+    outside = tmp_path / "outside"
+    (outside / "data").mkdir(parents=True)
+    (outside / "data" / "model.bin").write_bytes(b"weights")
+    (outside / "requirements.txt").write_text("click\n")
+    (build_context / "data").symlink_to(outside / "data")
+    (build_context / "requirements.txt").symlink_to(outside / "requirements.txt")
+    ignore_file_names = frozenset({".neuroignore"})
+    names = await _list_context_entries(
+        build_context, apolo_sdk.FileFilter().match, ignore_file_names
+    )
+
+    payload = b"".join([chunk async for chunk in _iter_tar_gz(build_context, names)])
+
+    with tarfile.open(fileobj=io.BytesIO(payload), mode="r:gz") as tar:
+        members = {member.name: member for member in tar.getmembers()}
+        assert members["data"].isdir()
+        assert members["data/model.bin"].isfile()
+        assert members["requirements.txt"].isfile()
+        model = tar.extractfile(members["data/model.bin"])
+        assert model is not None
+        assert model.read() == b"weights"
@@ -0,0 +1,62 @@
+import os
+import shlex
+import subprocess
+import tarfile
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+
+from apolo_extras.data.archive import compress_stream, max_tar_size
+from apolo_extras.data.common import Resource
+
+
+def _upload_command(uploaded: Path) -> Tuple[str, List[str]]:
+    # like cloud uploads, the object appears only once the whole input is read
+    part = shlex.quote(f"{uploaded}.part")
+    return "sh", ["-c", f"cat > {part} && mv {part} {shlex.quote(str(uploaded))}"]
+
+
+def test_max_tar_size_bounds_archive(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    (source / "nested").mkdir(parents=True)
+    (source / "empty").write_bytes(b"")
+    (source / "nested" / "random").write_bytes(os.urandom(100_000))
+    archive = tmp_path / "source.tar.gz"
+    subprocess.run(
+        ["tar", "zcf", str(archive), "-C", str(tmp_path), "source"], check=True
+    )
+
+    assert archive.stat().st_size <= max_tar_size(source)
+    assert max_tar_size(source / "nested" / "random") > 100_000
+
+
+async def test_compress_stream_uploads_archive(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "data.txt").write_text("data")
+    uploaded = tmp_path / "uploaded.tar.gz"
+
+    await compress_stream(
+        stream_command=_upload_command(uploaded),
+        source=Resource.from_path(source),
+        destination=Resource.from_str("s3://bucket/data.tar.gz"),
+    )
+
+    with tarfile.open(uploaded, "r:gz") as tar:
+        assert any(name.endswith("source/data.txt") for name in tar.getnames())
+
+
+async def test_compress_stream_failure_does_not_complete_upload(
+    tmp_path: Path,
+) -> None:
+    uploaded = tmp_path / "uploaded.tar.gz"
+
+    with pytest.raises(RuntimeError, match="tar exited with"):
+        await compress_stream(
+            stream_command=_upload_command(uploaded),
+            source=Resource.from_path(tmp_path / "missing"),
+            destination=Resource.from_str("s3://bucket/data.tar.gz"),
+        )
+
+    assert not uploaded.exists()
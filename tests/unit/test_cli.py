@@ -0,0 +1,22 @@
+import json
+
+from click.testing import CliRunner
+
+from apolo_extras.cli import main
+
+
+def test_lazy_subcommands_listed() -> None:
+    result = CliRunner().invoke(main, ["--help"])
+    assert result.exit_code == 0, result.output
+    for name in ("config", "data", "image", "init-aliases", "k8s", "seldon"):
+        assert f"  {name} " in result.output
+
+
+def test_lazy_subcommand_invoked() -> None:
+    result = CliRunner().invoke(
+        main, ["config", "build-registy-auth", "registry.io", "user", "password"]
+    )
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output) == {
+        "auths": {"registry.io": {"auth": "dXNlcjpwYXNzd29yZA=="}}
+    }
@@ -0,0 +1,31 @@
+import asyncio
+import time
+
+import pytest
+
+from apolo_extras.utils import CLIRunner
+
+
+async def test_run_command_failure() -> None:
+    with pytest.raises(RuntimeError, match="false exited with 1"):
+        await CLIRunner().run_command("false", [])
+
+
+async def test_run_command_cancel_kills_command() -> None:
+    task = asyncio.create_task(CLIRunner().run_command("sleep", ["10"]))
+    await asyncio.sleep(0.2)
+    started = time.monotonic()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert time.monotonic() - started < 5
+
+
+async def test_run_pipeline_cancel_kills_commands() -> None:
+    task = asyncio.create_task(CLIRunner().run_pipeline(("sleep", ["10"]), ("cat", [])))
+    await asyncio.sleep(0.2)
+    started = time.monotonic()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert time.monotonic() - started < 5
@@ -0,0 +1,47 @@
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from apolo_extras.data.operations import CopyOperation
+
+
+async def test_copy_onto_itself_is_skipped() -> None:
+    operation = CopyOperation(
+        source="/tmp/some-file",
+        destination="/tmp/some-file",
+        compress=False,
+        extract=False,
+        client=mock.Mock(),
+    )
+    with mock.patch("apolo_extras.data.operations.provide_temp_dir") as temp_dir_mock:
+        await operation.run()
+    temp_dir_mock.assert_not_called()
+
+
+def test_extraction_into_same_url_is_not_skipped() -> None:
+    operation = CopyOperation(
+        source="/tmp/some-file.tar",
+        destination="/tmp/some-file.tar",
+        compress=False,
+        extract=True,
+        client=mock.Mock(),
+    )
+    assert not operation._is_noop()
+
+
+def test_copy_onto_itself_through_other_path_is_skipped(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "some-file").write_text("data")
+    (tmp_path / "link").symlink_to(tmp_path / "some-file")
+    for destination in ("./some-file", "link", f"{tmp_path}//some-file"):
+        operation = CopyOperation(
+            source="some-file",
+            destination=destination,
+            compress=False,
+            extract=False,
+            client=mock.Mock(),
+        )
+        assert operation._is_noop(), destination
@@ -0,0 +1,22 @@
+import shlex
+
+from apolo_extras.data.remote import _build_data_copy_command
+
+
+def test_data_copy_command_quotes_urls() -> None:
+    command = _build_data_copy_command(
+        source="/var/storage/my data/",
+        destination="s3://bucket/it's here/",
+        extract=True,
+        compress=False,
+    )
+
+    assert shlex.split(command) == [
+        "apolo-extras",
+        "-v",
+        "data",
+        "cp",
+        "-x",
+        "/var/storage/my data/",
+        "s3://bucket/it's here/",
+    ]
@@ -0,0 +1,20 @@
+import base64
+from pathlib import Path
+
+import pytest
+
+from apolo_extras.k8s import _read_config_files
+
+
+def test_read_config_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("apolo_extras.k8s.B64_CHUNK_SIZE", 3)
+    (tmp_path / "db").write_bytes(b"\x00\x01\x02\x03\x04\x05\x06")
+    (tmp_path / "db-wal").write_bytes(b"wal")
+    (tmp_path / "db-shm").write_bytes(b"shm")
+    (tmp_path / "user.toml").write_text("[alias]\n")
+    (tmp_path / "cache").mkdir()
+
+    assert _read_config_files(tmp_path) == {
+        "db": base64.b64encode(b"\x00\x01\x02\x03\x04\x05\x06").decode(),
+        "user.toml": base64.b64encode(b"[alias]\n").decode(),
+    }
@@ -0,0 +1,23 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from apolo_extras.data.fs import _copy_file
+
+
+def test_copy_file(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    source.write_bytes(b"data" * 1024)
+    _copy_file(source, tmp_path / "destination")
+    assert (tmp_path / "destination").read_bytes() == b"data" * 1024
+
+
+def test_copy_file_onto_itself_keeps_contents(tmp_path: Path) -> None:
+    source = tmp_path / "source"
+    source.write_bytes(b"data")
+    (tmp_path / "link").symlink_to(source)
+    for destination in (tmp_path / "link", Path(f"{tmp_path}/./source")):
+        with pytest.raises(shutil.SameFileError):
+            _copy_file(source, destination)
+    assert source.read_bytes() == b"data"
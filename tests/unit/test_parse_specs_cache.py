@@ -0,0 +1,20 @@
+from unittest import mock
+
+import pytest
+
+from apolo_extras.data import remote
+from apolo_extras.data.remote import _parse_volumes
+
+
+def test_parse_volumes_is_cached_and_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(remote, "_PARSE_CACHE_SIZE", 2)
+    client = mock.Mock()
+    specs = [[f"storage:data{i}:/data{i}:ro"] for i in range(3)]
+
+    first = _parse_volumes(client, specs[0])
+    assert _parse_volumes(client, specs[0]) is first
+    assert client.parse.volumes.call_count == 1
+
+    _parse_volumes(client, specs[1])
+    _parse_volumes(client, specs[2])
+    assert list(remote._VOLUMES_CACHE[client]) == [tuple(specs[1]), tuple(specs[2])]
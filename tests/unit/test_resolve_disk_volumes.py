@@ -0,0 +1,33 @@
+from unittest import mock
+
+import apolo_sdk
+from yarl import URL
+
+from apolo_extras.common import _resolve_disk_volumes
+
+
+async def test_resolve_disk_volumes_replaces_names_with_ids() -> None:
+    disk_volumes = [
+        apolo_sdk.DiskVolume(
+            URL("disk://mycluster/myorg/myproject/disk-name"), "/mnt/disk"
+        ),
+        apolo_sdk.DiskVolume(
+            URL("disk://mycluster/myorg/myproject/disk-id/"), "/mnt/other", True
+        ),
+    ]
+    resolved_ids = {"disk-name": "disk-1", "disk-id": "disk-id"}
+
+    async def _resolve_disk(disk_uri: URL, *, client: apolo_sdk.Client) -> str:
+        return resolved_ids[disk_uri.path.rstrip("/").split("/")[-1]]
+
+    with mock.patch("apolo_cli.utils.resolve_disk", _resolve_disk):
+        resolved = await _resolve_disk_volumes(disk_volumes, mock.Mock())
+
+    assert resolved == [
+        apolo_sdk.DiskVolume(
+            URL("disk://mycluster/myorg/myproject/disk-1"), "/mnt/disk"
+        ),
+        apolo_sdk.DiskVolume(
+            URL("disk://mycluster/myorg/myproject/disk-id"), "/mnt/other", True
+        ),
+    ]
@@ -0,0 +1,95 @@
+import configparser
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from apolo_extras.data.common import Resource
+from apolo_extras.data.s3 import S3Copier, _get_aws_config_file, _write_aws_config
+
+
+def _read_s3_config(config_file: Path, section: str) -> str:
+    parser = configparser.ConfigParser(interpolation=None)
+    parser.read(config_file)
+    return parser.get(section, "s3")
+
+
+def test_aws_config_keeps_user_settings(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    user_config = tmp_path / "config"
+    user_config.write_text(
+        "[default]\nregion = eu-west-1\ns3 =\n  max_concurrent_requests = 20\n"
+    )
+    monkeypatch.setenv("AWS_CONFIG_FILE", str(user_config))
+    monkeypatch.delenv("AWS_PROFILE", raising=False)
+    transfer_config = {"multipart_chunksize": "64MB", "max_concurrent_requests": "10"}
+
+    config_file = tmp_path / "generated"
+    _write_aws_config(config_file, transfer_config)
+    s3_config = _read_s3_config(config_file, "default")
+    assert "region = eu-west-1" in config_file.read_text()
+    assert "multipart_chunksize = 64MB" in s3_config
+    assert "max_concurrent_requests = 20" in s3_config
+    assert "max_concurrent_requests = 10" not in s3_config
+
+
+def test_aws_config_for_named_profile(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("AWS_CONFIG_FILE", str(tmp_path / "missing"))
+    monkeypatch.setenv("AWS_PROFILE", "dev")
+
+    config_file = tmp_path / "generated"
+    _write_aws_config(config_file, {"multipart_chunksize": "64MB"})
+    s3_config = _read_s3_config(config_file, "profile dev")
+    assert "multipart_chunksize = 64MB" in s3_config
+
+
+def test_aws_config_file_is_written_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("AWS_CONFIG_FILE", str(tmp_path / "missing"))
+    transfer_config = {"max_queue_size": "4242"}
+
+    config_file = _get_aws_config_file(transfer_config)
+    assert _get_aws_config_file(dict(transfer_config)) == config_file
+    assert "max_queue_size = 4242" in config_file.read_text()
+
+
+def test_upload_stream_uses_transfer_config(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("AWS_CONFIG_FILE", str(tmp_path / "missing"))
+    copier = S3Copier(
+        source=Resource.from_path(tmp_path / "data"),
+        destination=Resource.from_str("s3://bucket/data.tar.gz"),
+    )
+
+    assert copier.get_upload_stream_command(expected_size=42) == (
+        "aws",
+        ["s3", "cp", "-", "s3://bucket/data.tar.gz", "--expected-size", "42"],
+    )
+    env = copier.get_stream_env()
+    assert env is not None
+    assert "multipart_chunksize = 64MB" in Path(env["AWS_CONFIG_FILE"]).read_text()
+
+
+@pytest.mark.parametrize(
+    "sync,args",
+    [
+        (False, ["s3", "cp", "--recursive"]),
+        (True, ["s3", "sync"]),
+    ],
+)
+def test_recursive_copy_syncs_only_if_enabled(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, sync: bool, args: List[str]
+) -> None:
+    monkeypatch.setattr("apolo_extras.data.s3.S3_SYNC", sync)
+    monkeypatch.setattr("sys.stdout.isatty", lambda: True)
+    copier = S3Copier(
+        source=Resource.from_str("s3://bucket/data/"),
+        destination=Resource.from_path(tmp_path / "data"),
+    )
+
+    assert copier._args == args + ["s3://bucket/data/", copier.destination.as_str()]
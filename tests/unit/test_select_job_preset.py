@@ -48,3 +48,21 @@ def test_when_nothing_fits_first_preset_is_used(mock_client: MockApoloClient) ->
     )
     mock_client.presets.update(presets)
     assert selected_preset is None
+
+
+def test_when_nothing_fits_default_preset_is_used_on_fallback(
+    mock_client: MockApoloClient,
+) -> None:
+    presets = {
+        "bad": Preset(cpu=1, memory=9999, credits_per_hour=Decimal("5")),
+        "gpu": Preset(cpu=4, memory=9999, credits_per_hour=Decimal("15"), nvidia_gpu=1),
+    }
+    mock_client.presets.update(presets)
+    selected_preset = select_job_preset(
+        preset=None,
+        client=mock_client,
+        min_mem=4096,
+        min_cpu=2,
+        fallback_to_default=True,
+    )
+    assert selected_preset == "bad"
@@ -0,0 +1,72 @@
+from typing import Any, List
+from unittest import mock
+
+import apolo_sdk
+import pytest
+
+from apolo_extras.common import _attach_job_stdout, _wait_job_finished
+from apolo_extras.const import EX_OK, EX_PLATFORMERROR
+
+
+def _job(status: apolo_sdk.JobStatus) -> Any:
+    job = mock.Mock()
+    job.id = "job-id"
+    job.status = status
+    job.history.exit_code = None
+    return job
+
+
+@pytest.mark.parametrize(
+    "final_status,exit_code",
+    [
+        (apolo_sdk.JobStatus.SUCCEEDED, EX_OK),
+        (apolo_sdk.JobStatus.FAILED, EX_PLATFORMERROR),
+        (apolo_sdk.JobStatus.CANCELLED, EX_PLATFORMERROR),
+    ],
+)
+async def test_wait_job_finished_polls_with_backoff(
+    final_status: apolo_sdk.JobStatus, exit_code: int
+) -> None:
+    statuses = [apolo_sdk.JobStatus.RUNNING] * 6 + [final_status]
+    client = mock.Mock()
+    client.jobs.status = mock.AsyncMock(side_effect=[_job(s) for s in statuses])
+    delays: List[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        delays.append(delay)
+
+    with mock.patch("apolo_extras.common.asyncio.sleep", fake_sleep):
+        result = await _wait_job_finished(
+            _job(apolo_sdk.JobStatus.PENDING), client, name="copy"
+        )
+
+    assert result == exit_code
+    assert delays == [0.5, 1.0, 2.0, 4.0, 8.0, 10.0, 10.0]
+
+
+async def test_attach_job_stdout_writes_output_by_lines(
+    capsysbinary: pytest.CaptureFixture[bytes],
+) -> None:
+    statuses = [apolo_sdk.JobStatus.RUNNING, apolo_sdk.JobStatus.SUCCEEDED]
+    client = mock.Mock()
+    client.jobs.status = mock.AsyncMock(side_effect=[_job(s) for s in statuses])
+
+    async def monitor(job_id: str) -> Any:
+        for chunk in (b"step ", b"1\nstep", b" 2\n", b"done"):
+            yield chunk
+
+    client.jobs.monitor = monitor
+    delays: List[float] = []
+
+    async def fake_sleep(delay: float) -> None:
+        delays.append(delay)
+
+    with mock.patch("apolo_extras.common.asyncio.sleep", fake_sleep):
+        result = await _attach_job_stdout(
+            _job(apolo_sdk.JobStatus.PENDING), client, name="builder"
+        )
+
+    assert result == EX_OK
+    assert capsysbinary.readouterr().out == b"step 1\nstep 2\ndone"
+    assert delays == [0.25, 0.25]
+    assert client.jobs.status.await_count == 2
@@ -0,0 +1,80 @@
+import os
+from pathlib import Path
+
+import pytest
+from aiohttp import ClientResponseError, web
+from aiohttp.test_utils import TestServer
+
+from apolo_extras.data import web as web_module
+from apolo_extras.data.common import Resource
+from apolo_extras.data.web import WebCopier
+
+
+@pytest.fixture
+def payload() -> bytes:
+    return bytes(range(256)) * 4099
+
+
+async def _copy(tmp_path: Path, payload: bytes) -> bytes:
+    source = tmp_path / "served" / "file.bin"
+    source.parent.mkdir()
+    source.write_bytes(payload)
+    app = web.Application()
+    app.router.add_static("/", source.parent)
+    async with TestServer(app) as server:
+        copier = WebCopier(
+            source=Resource.from_str(str(server.make_url("/file.bin"))),
+            destination=Resource.from_path(tmp_path / "dst" / "file.bin"),
+        )
+        result = await copier.perform_copy()
+    return result.as_path().read_bytes()
+
+
+async def test_web_copier_downloads_file(tmp_path: Path, payload: bytes) -> None:
+    assert await _copy(tmp_path, payload) == payload
+
+
+async def test_web_copier_downloads_ranges(
+    tmp_path: Path, payload: bytes, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(web_module, "WEB_RANGES_THRESHOLD", 1024)
+    assert await _copy(tmp_path, payload) == payload
+
+
+async def test_web_copier_failed_range_leaves_no_destination(
+    tmp_path: Path, payload: bytes, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(web_module, "WEB_RANGES_THRESHOLD", 1024)
+
+    async def handler(request: web.Request) -> web.Response:
+        if "Range" in request.headers:
+            raise web.HTTPInternalServerError()
+        return web.Response(body=payload, headers={"Accept-Ranges": "bytes"})
+
+    app = web.Application()
+    app.router.add_get("/file.bin", handler)
+    destination = tmp_path / "dst" / "file.bin"
+    async with TestServer(app) as server:
+        copier = WebCopier(
+            source=Resource.from_str(str(server.make_url("/file.bin"))),
+            destination=Resource.from_path(destination),
+        )
+        with pytest.raises(ClientResponseError):
+            await copier.perform_copy()
+    assert list(destination.parent.iterdir()) == []
+
+
+def test_pwrite_all_retries_partial_writes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pwrite = os.pwrite
+
+    def partial_pwrite(fd: int, data: bytes, offset: int) -> int:
+        return pwrite(fd, data[:3], offset)
+
+    monkeypatch.setattr(os, "pwrite", partial_pwrite)
+    destination = tmp_path / "file.bin"
+    with destination.open("wb") as file:
+        file.truncate(12)
+        web_module._pwrite_all(file.fileno(), b"0123456789", 2)
+    assert destination.read_bytes() == b"\0\x000123456789"